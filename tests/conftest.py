@@ -0,0 +1,24 @@
+# O pacote smart_home e a dependência `transitions` ficam dentro de venv/ neste repositório
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "venv"))
+sys.path.insert(1, os.path.join(RAIZ, "venv", "lib", "python3.10", "site-packages"))
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def caminho_config(tmp_path):
+    """Grava um configuracao.json com os dispositivos (tipo, id, estado[, atributos]) e rotinas dadas."""
+    def gravar(dispositivos, rotinas=None):
+        caminho = tmp_path / "configuracao.json"
+        registros = [{"id": d[1], "tipo": d[0], "nome": d[1], "estado": d[2],
+                      "atributos": d[3] if len(d) > 3 else {}} for d in dispositivos]
+        caminho.write_text(json.dumps({"hub": {"nome": "Teste", "versao": "1.0"}, "dispositivos": registros,
+                                       "rotinas": rotinas or {}}), encoding="utf-8")
+        return str(caminho)
+    return gravar
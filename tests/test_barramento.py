@@ -0,0 +1,119 @@
+from threading import Event
+
+from smart_home.core.barramento import FilaObserver, PoliticaOverflow
+from smart_home.core.eventos import Evento, TipoEvento
+from smart_home.core.observers import Observer
+
+
+class Registrador(Observer):
+    """Guarda o que recebeu; com `liberar` definido, a primeira entrega espera o teste liberar."""
+
+    def __init__(self, liberar: Event = None, falhar: bool = False):
+        self.recebidos = []
+        self.lotes = []
+        self.liberar = liberar
+        self.falhar = falhar
+
+    def _esperar(self):
+        if self.liberar is not None:
+            self.liberar.wait(5)
+
+    def update(self, evento):
+        self._esperar()
+        if self.falhar:
+            raise RuntimeError("falhou")
+        self.recebidos.append(evento)
+
+    def update_lote(self, eventos):
+        self._esperar()
+        self.lotes.append(list(eventos))
+
+
+def _evento(id_dispositivo, depois="on"):
+    return Evento(TipoEvento.COMANDO_EXECUTADO, id_dispositivo=id_dispositivo,
+                  detalhes={"comando": "x", "estado_antes": "off", "estado_depois": depois})
+
+
+def test_erro_no_observer_nao_conta_como_entregue(capsys):
+    fila = FilaObserver(Registrador(falhar=True))
+    fila.update(_evento("a"))
+    fila.drain(5)
+    fila.encerrar()
+    estatisticas = fila.estatisticas()
+    assert estatisticas["entregues"] == 0
+    assert estatisticas["erros"] == 1
+
+
+def _recebidos(observer):
+    return [(e.id_dispositivo, e.dados["estado_depois"]) for e in observer.recebidos]
+
+
+def test_coalescer_nao_mescla_abaixo_do_limite():
+    liberar = Event()
+    observer = Registrador(liberar)
+    fila = FilaObserver(observer, tamanho_max=100, politica=PoliticaOverflow.COALESCER)
+    fila.update(_evento("bloqueia"))
+    fila.update(_evento("a", "on"))
+    fila.update(_evento("a", "off"))
+    liberar.set()
+    fila.drain(5)
+    fila.encerrar()
+    assert _recebidos(observer) == [("bloqueia", "on"), ("a", "on"), ("a", "off")]
+    assert fila.estatisticas()["coalescidos"] == 0
+
+
+def test_coalescer_com_fila_cheia_troca_o_pendente_e_mantem_a_ordem():
+    liberar = Event()
+    observer = Registrador(liberar)
+    fila = FilaObserver(observer, tamanho_max=3, politica=PoliticaOverflow.COALESCER)
+    fila.update(_evento("bloqueia"))
+    fila.drain(0.05)  # a thread já retirou o primeiro evento e está presa nele
+    fila.update(_evento("a", "on"))
+    fila.update(_evento("b", "on"))
+    fila.update(_evento("c", "on"))
+    fila.update(_evento("a", "off"))  # fila cheia: o "a" pendente sai e o novo entra no fim
+    fila.update(_evento("d", "on"))   # fila cheia e sem "d" pendente: descarta o mais antigo ("b")
+    liberar.set()
+    fila.drain(5)
+    fila.encerrar()
+    assert _recebidos(observer) == [("bloqueia", "on"), ("c", "on"), ("a", "off"), ("d", "on")]
+    estatisticas = fila.estatisticas()
+    assert (estatisticas["coalescidos"], estatisticas["descartados"]) == (1, 1)
+
+
+def test_erros_contam_eventos_do_lote(capsys):
+    class FalhaNoLote(Registrador):
+        def update_lote(self, eventos):
+            raise RuntimeError("falhou")
+
+    fila = FilaObserver(FalhaNoLote())
+    fila.update_lote([_evento("a"), _evento("b"), _evento("c")])
+    fila.drain(5)
+    fila.encerrar()
+    assert (fila.estatisticas()["erros"], fila.estatisticas()["entregues"]) == (3, 0)
+
+
+def test_lote_chega_inteiro_ao_update_lote():
+    observer = Registrador()
+    fila = FilaObserver(observer)
+    fila.update_lote([_evento("a"), _evento("b")])
+    fila.drain(5)
+    fila.encerrar()
+    assert [[e.id_dispositivo for e in lote] for lote in observer.lotes] == [["a", "b"]]
+    assert fila.estatisticas()["entregues"] == 2
+
+
+def test_descartar_antigo_respeita_o_limite_em_eventos():
+    liberar = Event()
+    observer = Registrador(liberar)
+    fila = FilaObserver(observer, tamanho_max=3, politica=PoliticaOverflow.DESCARTAR_ANTIGO)
+    fila.update(_evento("bloqueia"))
+    fila.drain(0.05)  # a thread já retirou o primeiro evento e está presa nele
+    for id_dispositivo in "abcde":
+        fila.update(_evento(id_dispositivo))
+    assert fila.estatisticas()["pendentes"] == 3
+    liberar.set()
+    fila.drain(5)
+    fila.encerrar()
+    assert [e.id_dispositivo for e in observer.recebidos] == ["bloqueia", "c", "d", "e"]
+    assert fila.estatisticas()["descartados"] == 2
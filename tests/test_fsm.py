@@ -0,0 +1,166 @@
+import random
+
+import pytest
+from transitions import Machine, MachineError
+
+from smart_home.core.dispositivos import Dispositivo, TipoDispositivo
+from smart_home.core.erros import TransicaoInvalidaError
+from smart_home.dispositivos.alarme import Alarme
+from smart_home.dispositivos.luz import Luz, Cor
+from smart_home.dispositivos.microondas import Microondas
+from smart_home.dispositivos.porta import Porta
+from smart_home.dispositivos.tomada import Tomada
+from smart_home.dispositivos.tv import Tv
+
+CLASSES = [Luz, Tomada, Porta, Alarme, Tv, Microondas]
+
+
+class ModeloLegado:
+    """Modelo no formato antigo: atributos comuns e um transitions.Machine por instância."""
+
+    def __init__(self, classe, estado_inicial):
+        self._nome = self.nome = "legado"
+        self._brilho = 50
+        self._cor = Cor.NEUTRA
+        self.tentativas_invalidas = 0
+        self.potencia_w = 100
+        self._consumo_wh = 0
+        self._hora_ligada = None
+        for nome, valor in vars(classe).items():
+            if callable(valor) and nome.startswith(("on_enter_", "on_exit_", "validar_", "pode_")):
+                setattr(self, nome, valor.__get__(self))
+        self.maquina = Machine(model=self, states=classe.estados, transitions=classe.transicoes,
+                               initial=estado_inicial, auto_transitions=False)
+
+
+def _criar(classe):
+    return classe("d1", "novo", potencia_w=100) if classe in (Tomada, Tv, Microondas) else classe("d1", "novo")
+
+
+def _disparar(modelo, trigger, erro):
+    try:
+        return getattr(modelo, trigger)()
+    except erro:
+        return "invalida"
+
+
+@pytest.mark.parametrize("classe", CLASSES, ids=lambda c: c.__name__)
+def test_fsm_compartilhada_equivale_ao_machine_por_instancia(classe):
+    triggers = sorted({t["trigger"] for t in classe.transicoes})
+    aleatorio = random.Random(classe.__name__)
+    novo = _criar(classe)
+    legado = ModeloLegado(classe, novo.state)
+
+    for _ in range(300):
+        trigger = aleatorio.choice(triggers)
+        assert getattr(novo, f"may_{trigger}")() == getattr(legado, f"may_{trigger}")()
+        assert _disparar(novo, trigger, TransicaoInvalidaError) == _disparar(legado, trigger, MachineError)
+        assert novo.state == legado.state
+        assert getattr(novo, "tentativas_invalidas", 0) == legado.tentativas_invalidas
+
+
+def test_trigger_sem_transicao_no_estado_atual():
+    porta = Porta("p1", "Porta")
+    porta.destrancar()
+    porta.abrir()
+    assert porta.may_trancar() is False
+    with pytest.raises(TransicaoInvalidaError):
+        porta.trancar()
+    assert porta.state == "aberta"
+
+
+def test_estado_invalido_e_rejeitado():
+    with pytest.raises(ValueError):
+        Luz("l1", "Luz").state = "ligadissima"
+
+
+def test_maquina_e_compartilhada_entre_instancias():
+    assert Luz("a", "A").maquina is Luz("b", "B").maquina
+    assert not hasattr(Luz("a", "A"), "__dict__")
+
+
+class Registro:
+    """Callbacks que anotam cada chamada (com os argumentos) em `self.chamadas`."""
+
+    def antes(self, *args, **kwargs):
+        self.chamadas.append(("antes", args, kwargs))
+
+    def depois(self, *args, **kwargs):
+        self.chamadas.append(("depois", args, kwargs))
+
+    def contar(self, *args, **kwargs):
+        self.chamadas.append(("contar", args, kwargs))
+
+    def bloqueado(self, *args, bloquear=False, **kwargs):
+        return bloquear
+
+    def liberado(self, *args, bloquear=False, **kwargs):
+        return not bloquear
+
+    def on_enter_a(self, *args, **kwargs):
+        self.chamadas.append(("entrou_a", args, kwargs))
+
+    def on_exit_a(self, *args, **kwargs):
+        self.chamadas.append(("saiu_a", args, kwargs))
+
+    def on_enter_b(self, *args, **kwargs):
+        self.chamadas.append(("entrou_b", args, kwargs))
+
+    def on_exit_b(self, *args, **kwargs):
+        self.chamadas.append(("saiu_b", args, kwargs))
+
+    def on_enter_c(self, *args, **kwargs):
+        self.chamadas.append(("entrou_c", args, kwargs))
+
+    estados = ["a", "b", "c"]
+    transicoes = [
+        {"trigger": "ir", "source": "a", "dest": "b", "before": "antes", "after": ["depois", "contar"]},
+        {"trigger": "ir", "source": "b", "dest": "c", "unless": "bloqueado"},
+        {"trigger": "ir", "source": "b", "dest": "a", "after": "depois"},  # quando a anterior é barrada
+        {"trigger": "ficar", "source": ["a", "b"], "dest": "=", "before": "antes"},
+        {"trigger": "interno", "source": "*", "dest": None, "before": "antes", "after": "depois"},
+        {"trigger": "voltar", "source": "c", "dest": "a", "conditions": "liberado", "unless": ["bloqueado"]},
+        {"trigger": "reiniciar", "source": "*", "dest": "a", "conditions": ["liberado"], "after": "contar"},
+    ]
+
+
+class DispositivoCompleto(Registro, Dispositivo):
+    """Tabela que usa before/after/unless, dest '=' e None, source lista e '*'."""
+
+    def __init__(self):
+        super().__init__("x", "x", TipoDispositivo.ALARM)
+        self.chamadas = []
+        self.state = "a"
+
+    def get_estado_dict(self) -> dict:
+        return {"estado": self.state, "atributos": {}}
+
+
+class RegistroLegado(Registro):
+    def __init__(self):
+        self.chamadas = []
+        self.maquina = Machine(model=self, states=Registro.estados, transitions=Registro.transicoes,
+                               initial="a", auto_transitions=False)
+
+
+def _disparar_com(modelo, trigger, erro, kwargs):
+    try:
+        return getattr(modelo, trigger)(**kwargs)
+    except erro:
+        return "invalida"
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_callbacks_e_destinos_especiais_equivalem_ao_machine(semente):
+    aleatorio = random.Random(semente)
+    triggers = sorted({t["trigger"] for t in Registro.transicoes})
+    novo, legado = DispositivoCompleto(), RegistroLegado()
+
+    for _ in range(200):
+        trigger = aleatorio.choice(triggers)
+        kwargs = {"bloquear": aleatorio.random() < 0.4}
+        assert getattr(novo, f"may_{trigger}")(**kwargs) == getattr(legado, f"may_{trigger}")(**kwargs)
+        assert (_disparar_com(novo, trigger, TransicaoInvalidaError, kwargs)
+                == _disparar_com(legado, trigger, MachineError, kwargs))
+        assert novo.state == legado.state
+        assert novo.chamadas == legado.chamadas
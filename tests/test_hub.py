@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from smart_home.core.dispositivos import DispositivoStub
+from smart_home.core.erros import ConfiguracaoInvalidaError, DispositivoNaoEncontradoError
+from smart_home.core.hub import HubAutomacao
+from smart_home.core.observers import Observer
+
+
+class ObserverColetor(Observer):
+    def __init__(self):
+        self.eventos = []
+
+    def update(self, evento):
+        self.eventos.append(evento)
+
+
+@pytest.fixture
+def luzes(caminho_config):
+    # l2 tem uma cor inexistente: no carregamento preguiçoso o erro só aparece ao usá-la
+    return caminho_config([("LIGHT", "l1", "on"), ("LIGHT", "l2", "on", {"cor": "ROXA"}), ("LIGHT", "l3", "on")])
+
+
+def test_massa_notifica_alterados_mesmo_com_erro_no_meio(luzes):
+    hub = HubAutomacao(luzes, carregamento_preguicoso=True)
+    coletor = ObserverColetor()
+    hub.adicionar_observer(coletor)
+
+    with pytest.raises(ConfiguracaoInvalidaError):
+        hub.executar_em_massa({"tipo": "LIGHT", "estado": "on"}, "desligar")
+
+    assert hub.get_dispositivo("l1").state == "off"
+    assert [(e.id_dispositivo, e.dados["estado_depois"]) for e in coletor.eventos] == [("l1", "off")]
+
+
+def test_massa_e_comando_individual_geram_o_mesmo_evento(caminho_config):
+    caminho = caminho_config([("LIGHT", "l1", "off"), ("LIGHT", "l2", "off")])
+    hub = HubAutomacao(caminho)
+    coletor = ObserverColetor()
+    hub.adicionar_observer(coletor)
+
+    hub.executar_comando("l1", "ligar")
+    resumo = hub.executar_em_massa(lambda d: d.id == "l2", "ligar")
+
+    assert resumo["executados"] == 1
+    assert [(e.id_dispositivo, e.dados) for e in coletor.eventos] == [
+        ("l1", {"comando": "ligar", "args": None, "estado_antes": "off", "estado_depois": "on"}),
+        ("l2", {"comando": "ligar", "args": None, "estado_antes": "off", "estado_depois": "on"}),
+    ]
+
+
+def test_stub_guarda_atributos_sem_alterar_tipos():
+    registro = {"tipo": "OUTLET", "nome": "t", "estado": "off"}
+    a = DispositivoStub({**registro, "id": "a", "atributos": {"potencia_w": 1.0}})
+    b = DispositivoStub({**registro, "id": "b", "atributos": {}})
+
+    assert a.dados["atributos"] == {"potencia_w": 1.0} and isinstance(a.potencia_w, float)
+    assert b.potencia_w == 100 and b._atributos is None
+    assert b.dados == {"id": "b", "tipo": "OUTLET", "nome": "t", "estado": "off", "atributos": {}}
+
+
+def test_stubs_exportam_os_registros_como_foram_carregados(caminho_config, tmp_path):
+    caminho = caminho_config([("LIGHT", "l1", "on", {"brilho": 70, "cor": "QUENTE"}),
+                              ("OUTLET", "t1", "off", {"potencia_w": 120}), ("DOOR", "p1", "trancada")])
+    saida = tmp_path / "exportada.json"
+    HubAutomacao(caminho, carregamento_preguicoso=True).exportar_configuracao(str(saida))
+
+    def dispositivos(arquivo):
+        with open(arquivo, encoding="utf-8") as f:
+            return json.load(f)["dispositivos"]
+    assert dispositivos(saida) == dispositivos(caminho)
+
+
+def test_hidratar_dispositivo_removido_levanta_nao_encontrado(caminho_config):
+    hub = HubAutomacao(caminho_config([("LIGHT", "l1", "off")]), carregamento_preguicoso=True)
+    stub = hub.listar_dispositivos()[0]
+    hub.remover_dispositivo("l1")  # como se outra thread removesse entre a busca e a hidratação
+    with pytest.raises(DispositivoNaoEncontradoError):
+        hub._hidratar(stub)
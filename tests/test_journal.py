@@ -0,0 +1,103 @@
+import json
+import threading
+
+import pytest
+
+from smart_home.core.hub import HubAutomacao
+from smart_home.core.persistencia import JournalEstado
+from smart_home.dispositivos.luz import Luz
+
+
+@pytest.fixture
+def base(tmp_path):
+    return str(tmp_path / "configuracao")
+
+
+def _registro(seq, id_dispositivo, estado):
+    return json.dumps({"seq": seq, "op": "set", "dispositivo": {
+        "id": id_dispositivo, "tipo": "LIGHT", "nome": id_dispositivo, "estado": estado, "atributos": {}}}) + "\n"
+
+
+def _estados(config):
+    return {d["id"]: d["estado"] for d in config["dispositivos"]}
+
+
+def _journal_com(base, linhas):
+    journal = JournalEstado(base)
+    journal.compactar({"dispositivos": [], "rotinas": {}})
+    with open(journal.caminho_journal, "w", encoding="utf-8") as f:
+        f.write("".join(linhas))
+    return JournalEstado(base)
+
+
+def test_hub_restaura_estado_do_journal(caminho_config, base):
+    caminho = caminho_config([("LIGHT", "l1", "off"), ("LIGHT", "l2", "off"), ("OUTLET", "t1", "off")])
+    hub = HubAutomacao(caminho, journal=JournalEstado(base))
+    hub.executar_comando("l1", "ligar")
+    hub.executar_comando("t1", "ligar")
+    hub.remover_dispositivo("l2")
+    hub._journal.fechar()
+
+    restaurado = HubAutomacao(caminho, journal=JournalEstado(base))
+    estados = {d.id: d.state for d in restaurado.listar_dispositivos()}
+    assert estados == {"l1": "on", "t1": "on"}
+
+
+def test_ultima_linha_incompleta_e_descartada_e_cortada(base, capsys):
+    journal = _journal_com(base, [_registro(1, "l1", "on"), '{"seq": 2, "op": "se'])
+    assert _estados(journal.carregar()) == {"l1": "on"}
+    assert "última" in capsys.readouterr().out
+    with open(journal.caminho_journal, encoding="utf-8") as f:
+        assert f.read() == _registro(1, "l1", "on")
+
+
+def test_corrupcao_no_meio_avisa_e_aplica_os_registros_seguintes(base, capsys):
+    journal = _journal_com(base, [_registro(1, "l1", "on"), "lixo\n", _registro(3, "l2", "on")])
+    assert _estados(journal.carregar()) == {"l1": "on", "l2": "on"}
+    assert "linha 2" in capsys.readouterr().out
+
+
+def test_registro_sem_seq_e_ignorado(base, capsys):
+    sem_seq = json.dumps({"op": "del", "id": "l1"}) + "\n"
+    journal = _journal_com(base, [_registro(1, "l1", "on"), sem_seq, _registro(2, "l2", "on")])
+    assert _estados(journal.carregar()) == {"l1": "on", "l2": "on"}
+    assert "linha 2" in capsys.readouterr().out
+
+
+def test_comando_em_massa_grava_o_lote_com_um_fsync(caminho_config, base, monkeypatch):
+    caminho = caminho_config([("LIGHT", f"l{i}", "on") for i in range(50)] + [("OUTLET", "t1", "on")])
+    hub = HubAutomacao(caminho, journal=JournalEstado(base, fsync=True))
+    chamadas = []
+    monkeypatch.setattr("smart_home.core.persistencia.os.fsync", chamadas.append)
+    hub.executar_em_massa({"tipo": "LIGHT"}, "desligar")
+    hub._journal.fechar()
+    assert len(chamadas) == 1
+    estados = _estados(JournalEstado(base).carregar())
+    assert all(estados[f"l{i}"] == "off" for i in range(50)) and estados["t1"] == "on"
+
+
+def test_adicionar_e_remover_durante_compactacoes_de_outra_thread(caminho_config, base):
+    caminho = caminho_config([("LIGHT", "l1", "off")] + [("LIGHT", f"x{i}", "off") for i in range(200)])
+    hub = HubAutomacao(caminho, journal=JournalEstado(base, compactar_a_cada=1))
+    erros, parar = [], threading.Event()
+
+    def alternar():
+        try:
+            while not parar.is_set():
+                for comando in ("ligar", "desligar"):
+                    hub._aplicar_comando("l1", comando)  # cada alteração compacta o journal
+        except Exception as e:
+            erros.append(e)
+
+    thread = threading.Thread(target=alternar)
+    thread.start()
+    try:
+        for i in range(100):
+            hub.adicionar_dispositivo(Luz(f"n{i}", "nova"))
+            hub.remover_dispositivo(f"x{i}")
+    finally:
+        parar.set()
+        thread.join()
+    hub._journal.fechar()
+    assert erros == []
+    assert len(HubAutomacao(caminho, journal=JournalEstado(base)).listar_dispositivos()) == 201
@@ -0,0 +1,72 @@
+import csv
+
+import pytest
+
+from smart_home.core.eventos import Evento, TipoEvento
+from smart_home.core.logger import CABECALHO, CSVLogger
+
+
+@pytest.fixture
+def novo_logger():
+    # CSVLogger é um singleton; cada teste precisa de uma instância própria
+    criados = []
+
+    def criar(caminho, **kwargs):
+        CSVLogger._instance = None
+        logger = CSVLogger(str(caminho), **kwargs)
+        criados.append(logger)
+        return logger
+
+    yield criar
+    for logger in criados:
+        logger.close()
+    CSVLogger._instance = None
+
+
+def _evento(i, antes="off", depois="on"):
+    return Evento(TipoEvento.COMANDO_EXECUTADO, id_dispositivo=f"luz_{i}",
+                  detalhes={"comando": "ligar", "estado_antes": antes, "estado_depois": depois})
+
+
+def _linhas(caminho):
+    with open(caminho, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_modo_direto_grava_cabecalho_e_ignora_eventos_sem_mudanca(tmp_path, novo_logger):
+    caminho = tmp_path / "eventos.csv"
+    logger = novo_logger(caminho)
+    logger.update(_evento(1))
+    logger.update(_evento(2, antes="on", depois="on"))
+    logger.update_lote([_evento(3), _evento(4)])
+    linhas = _linhas(caminho)
+    assert linhas[0] == CABECALHO
+    assert [linha[1] for linha in linhas[1:]] == ["luz_1", "luz_3", "luz_4"]
+
+
+def test_modo_bufferizado_grava_tudo_ao_fechar(tmp_path, novo_logger):
+    caminho = tmp_path / "eventos.csv"
+    logger = novo_logger(caminho, bufferizado=True, tamanho_lote=7, intervalo_flush=60)
+    for i in range(100):
+        logger.update(_evento(i))
+    logger.close()
+    assert [linha[1] for linha in _linhas(caminho)[1:]] == [f"luz_{i}" for i in range(100)]
+
+
+def test_flush_com_erro_mantem_os_eventos_na_fila(tmp_path, novo_logger, monkeypatch, capsys):
+    caminho = tmp_path / "eventos.csv"
+    logger = novo_logger(caminho, bufferizado=True, tamanho_lote=1000, intervalo_flush=60)
+    for i in range(3):
+        logger.update(_evento(i))
+
+    def falhar():
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(logger, "_abrir_arquivo", falhar)
+    assert logger.flush() is False
+    assert "disco cheio" in capsys.readouterr().out
+
+    monkeypatch.undo()
+    logger.update(_evento(3))
+    assert logger.flush() is True
+    assert [linha[1] for linha in _linhas(caminho)[1:]] == ["luz_0", "luz_1", "luz_2", "luz_3"]
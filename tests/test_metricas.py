@@ -0,0 +1,38 @@
+import pytest
+
+from smart_home.core import hub as modulo_hub
+from smart_home.core.hub import HubAutomacao
+
+ROTINA = {"r": [{"id": "l1", "comando": "ligar"}, {"id": "l1", "comando": "definir_brilho"}]}
+
+
+@pytest.fixture
+def caminho(caminho_config):
+    return caminho_config([("LIGHT", "l1", "off"), ("LIGHT", "l2", "off")], rotinas=ROTINA)
+
+
+def test_sem_instrumentacao_o_hub_nao_le_o_relogio(caminho, monkeypatch):
+    hub = HubAutomacao(caminho)
+
+    class RelogioProibido:
+        @staticmethod
+        def perf_counter():
+            raise AssertionError("perf_counter chamado com a instrumentação desligada")
+    monkeypatch.setattr(modulo_hub, "time", RelogioProibido)
+
+    hub.executar_em_massa({"tipo": "LIGHT"}, "ligar")
+    hub.executar_comando("l2", "desligar")
+    assert hub.executar_rotina("r").duracao_s is None
+    assert hub.metricas() is None
+
+
+def test_definir_da_luz_conta_como_transicao(caminho):
+    hub = HubAutomacao(caminho, instrumentacao=True)
+    hub.executar_rotina("r")
+    hub.executar_em_massa({"tipo": "LIGHT", "estado": "off"}, "ligar")
+
+    metricas = hub.metricas()
+    assert metricas["transicao"]["LIGHT.definir_brilho"]["contagem"] == 1
+    assert metricas["transicao"]["LIGHT.ligar"]["contagem"] == 2
+    assert metricas["comando"]["ligar (massa)"]["contagem"] == 1
+    assert metricas["rotina"]["r"]["contagem"] == 1
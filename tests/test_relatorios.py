@@ -0,0 +1,133 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from smart_home.core import relatorios
+from smart_home.core.logger import CABECALHO
+from smart_home.dispositivos.luz import Luz
+from smart_home.dispositivos.tomada import Tomada
+
+
+def _evento(timestamp, id_dispositivo, comando):
+    antes, depois = ("off", "on") if comando == "ligar" else ("on", "off")
+    return {"timestamp": timestamp, "id_dispositivo": id_dispositivo, "evento": comando,
+            "estado_origem": antes, "estado_destino": depois}
+
+
+@pytest.fixture
+def dispositivos():
+    return [Luz("l1", "Luz"), Tomada("t1", "Tomada", potencia_w=1000)]
+
+
+@pytest.fixture
+def caminho_eventos(tmp_path):
+    def gravar(eventos):
+        caminho = tmp_path / "eventos.csv"
+        linhas = [",".join(CABECALHO)] + [",".join(e[c] for c in ("timestamp", "id_dispositivo", "evento",
+                                                                    "estado_origem", "estado_destino"))
+                                          for e in eventos]
+        caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+        return str(caminho)
+    return gravar
+
+
+def test_intervalo_que_atravessa_a_janela_e_recortado(dispositivos, caminho_eventos):
+    caminho = caminho_eventos([
+        _evento("2025-01-01T00:00:00", "l1", "ligar"),
+        _evento("2025-01-03T00:00:00", "l1", "desligar"),
+    ])
+    resultado = relatorios.gerar_relatorios(dispositivos, caminho, desde=datetime(2025, 1, 2),
+                                            ate=datetime(2025, 1, 2, 23, 59, 59))
+    assert resultado["tempo_luz_ligada"] == {"l1": 86399.0}
+    assert resultado["dispositivos_mais_usados"] == []  # nenhum evento dentro da janela
+
+
+def test_ligado_antes_e_desligado_dentro_da_janela(dispositivos, caminho_eventos):
+    caminho = caminho_eventos([
+        _evento("2025-01-01T10:00:00", "t1", "ligar"),
+        _evento("2025-01-02T01:00:00", "t1", "desligar"),
+    ])
+    resultado = relatorios.gerar_relatorios(dispositivos, caminho, desde=datetime(2025, 1, 2))
+    assert resultado["consumo_tomada"] == {"t1": 1000.0}
+    assert resultado["dispositivos_mais_usados"] == [("t1", 1)]
+
+
+def test_ainda_ligado_conta_ate_o_fim_da_janela(dispositivos, caminho_eventos):
+    caminho = caminho_eventos([_evento("2025-01-01T23:00:00", "l1", "ligar")])
+    resultado = relatorios.gerar_relatorios(dispositivos, caminho, desde=datetime(2025, 1, 1),
+                                            ate=datetime(2025, 1, 2))
+    assert resultado["tempo_luz_ligada"] == {"l1": 3600.0}
+
+
+def test_ainda_ligado_so_com_desde_conta_ate_agora(dispositivos, caminho_eventos):
+    ligada = datetime.now() - timedelta(hours=2)
+    caminho = caminho_eventos([_evento(ligada.isoformat(), "l1", "ligar")])
+    resultado = relatorios.gerar_relatorios(dispositivos, caminho, desde=ligada - timedelta(hours=1))
+    assert 7200 <= resultado["tempo_luz_ligada"]["l1"] < 7260
+
+
+def test_sem_janela_equivale_as_funcoes_originais(dispositivos, caminho_eventos):
+    eventos = [
+        _evento("2025-01-01T00:00:00", "l1", "ligar"),
+        _evento("2025-01-01T00:10:00", "t1", "ligar"),
+        _evento("2025-01-01T01:00:00", "l1", "desligar"),
+        _evento("2025-01-01T03:10:00", "t1", "desligar"),
+        _evento("2025-01-01T04:00:00", "l1", "ligar"),
+    ]
+    resultado = relatorios.gerar_relatorios(dispositivos, caminho_eventos(eventos))
+    assert resultado["tempo_luz_ligada"] == relatorios.relatorio_tempo_luz_ligada(eventos, dispositivos) == {"l1": 3600.0}
+    assert resultado["consumo_tomada"] == relatorios.relatorio_consumo_tomada(eventos, dispositivos) == {"t1": 3000.0}
+    assert resultado["dispositivos_mais_usados"] == relatorios.relatorio_dispositivos_mais_usados(eventos)
+
+
+def _anexar(caminho, eventos):
+    with open(caminho, "a", encoding="utf-8") as f:
+        for e in eventos:
+            f.write(",".join(e[c] for c in ("timestamp", "id_dispositivo", "evento", "estado_origem", "estado_destino")) + "\n")
+
+
+def test_checkpoint_continua_pela_posicao_no_csv(tmp_path, dispositivos, caminho_eventos):
+    antes = [
+        _evento("2025-01-01T10:00:00", "l1", "ligar"),
+        _evento("2025-01-01T10:00:00", "t1", "ligar"),  # mesmo timestamp
+    ]
+    caminho = caminho_eventos(antes)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    relatorios.RelatoriosObserver.carregar(checkpoint, caminho).salvar_checkpoint(checkpoint, caminho)
+
+    # Depois do checkpoint chegam eventos com timestamp repetido e fora de ordem
+    _anexar(caminho, [
+        _evento("2025-01-01T10:00:00", "l1", "desligar"),
+        _evento("2025-01-01T09:00:00", "t1", "desligar"),
+        _evento("2025-01-01T11:00:00", "l1", "ligar"),
+    ])
+    continuado = relatorios.RelatoriosObserver.carregar(checkpoint, caminho).resultados(dispositivos)
+    completo = relatorios.RelatoriosObserver.carregar(str(tmp_path / "inexistente.json"), caminho).resultados(dispositivos)
+    assert continuado == completo
+    assert continuado["dispositivos_mais_usados"] == [("l1", 3), ("t1", 2)]
+
+
+def test_checkpoint_maior_que_o_csv_reconstroi(tmp_path, dispositivos, caminho_eventos):
+    caminho = caminho_eventos([_evento("2025-01-01T10:00:00", "l1", "ligar")] * 3)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    relatorios.RelatoriosObserver.carregar(checkpoint, caminho).salvar_checkpoint(checkpoint, caminho)
+    caminho = caminho_eventos([_evento("2025-01-02T10:00:00", "l1", "ligar")])  # arquivo recriado, menor
+    resultado = relatorios.RelatoriosObserver.carregar(checkpoint, caminho).resultados(dispositivos)
+    assert resultado["dispositivos_mais_usados"] == [("l1", 1)]
+
+
+def test_checkpoint_sem_posicao_no_csv_reconstroi_sem_contar_duas_vezes(tmp_path, dispositivos, caminho_eventos):
+    caminho = caminho_eventos([_evento("2025-01-01T10:00:00", "l1", "ligar"),
+                               _evento("2025-01-01T11:00:00", "l1", "desligar")])
+    checkpoint = tmp_path / "checkpoint.json"
+    observer = relatorios.RelatoriosObserver.carregar(str(checkpoint), caminho)
+    observer.salvar_checkpoint(str(checkpoint), caminho)
+    dados = json.loads(checkpoint.read_text(encoding="utf-8"))
+    assert "ultimo_timestamp" not in dados
+    del dados["tamanho_eventos"]  # como os checkpoints gravados sem caminho_eventos
+    checkpoint.write_text(json.dumps(dados), encoding="utf-8")
+
+    resultado = relatorios.RelatoriosObserver.carregar(str(checkpoint), caminho).resultados(dispositivos)
+    assert resultado["dispositivos_mais_usados"] == [("l1", 2)]
+    assert resultado["tempo_luz_ligada"] == {"l1": 3600.0}
@@ -0,0 +1,74 @@
+import pytest
+
+from smart_home.core.erros import ConfiguracaoInvalidaError
+from smart_home.core.hub import HubAutomacao
+from smart_home.core.rotinas import ExecutorRotinas
+
+DISPOSITIVOS = [("LIGHT", "l1", "off"), ("LIGHT", "l2", "off"), ("LIGHT", "l3", "off")]
+
+
+def _status(resultado):
+    return {passo.nome: passo.status for passo in resultado.passos}
+
+
+def test_dependentes_de_passo_com_erro_sao_pulados(caminho_config):
+    caminho = caminho_config(DISPOSITIVOS, rotinas={"r": [
+        {"id": "l1", "comando": "ligar", "nome": "a"},
+        {"id": "inexistente", "comando": "ligar", "nome": "b"},
+        {"id": "l3", "comando": "ligar", "depende_de": ["b"]},
+        {"id": "l2", "comando": "ligar", "depende_de": [2]},
+    ]})
+    hub = HubAutomacao(caminho)
+    resultado = hub.executar_rotina("r")
+
+    assert _status(resultado) == {"a": "ok", "b": "erro", "2": "pulado", "3": "pulado"}
+    assert not resultado.sucesso
+    assert hub.get_dispositivo("l3").state == "off"
+    assert hub.get_dispositivo("l2").state == "off"
+
+
+def test_grupos_numericos_e_texto_sao_comparados_como_inteiros():
+    passos = [{"id": "l1", "comando": "ligar", "grupo": "10"},
+              {"id": "l2", "comando": "ligar", "grupo": 2},
+              {"id": "l3", "comando": "ligar", "grupo": 1}]
+    assert ExecutorRotinas.dependencias(passos) == [[1, 2], [2], []]
+
+
+@pytest.mark.parametrize("grupo", ["um", 1.5, None, True])
+def test_grupo_invalido_e_rejeitado_ao_carregar(caminho_config, grupo):
+    caminho = caminho_config(DISPOSITIVOS, rotinas={"r": [{"id": "l1", "comando": "ligar", "grupo": grupo}]})
+    with pytest.raises(ConfiguracaoInvalidaError, match="Rotina 'r'"):
+        HubAutomacao(caminho)
+
+
+def test_rotina_sequencial_tambem_devolve_resultado(caminho_config):
+    caminho = caminho_config(DISPOSITIVOS, rotinas={"r": [
+        {"id": "l1", "comando": "ligar"},
+        {"id": "l1", "comando": "ligar"},
+        {"id": "inexistente", "comando": "ligar"},
+    ]})
+    resultado = HubAutomacao(caminho).executar_rotina("r")
+
+    assert _status(resultado) == {"0": "ok", "1": "ignorado", "2": "erro"}
+    assert (resultado.passos[0].estado_antes, resultado.passos[0].estado_depois) == ("off", "on")
+
+
+def test_passos_sem_campos_e_grupos_esperam_uns_aos_outros():
+    a, b, c = ({"id": f"l{i}", "comando": "ligar"} for i in range(3))
+    assert ExecutorRotinas.dependencias([{**a, "grupo": 1}, {**b, "grupo": 1}, c]) == [[], [], [0, 1]]
+    assert ExecutorRotinas.dependencias([a, {**b, "grupo": 1}, {**c, "grupo": 2}]) == [[], [0], [1, 0]]
+    # Formato antigo: cada passo só precisa esperar o anterior
+    assert ExecutorRotinas.dependencias([a, b, c]) == [[], [0], [1]]
+
+
+@pytest.mark.parametrize("rotina", [
+    [{"id": "l1", "comando": "ligar"}, {"id": "l2", "comando": "ligar"}],
+    [{"id": "l1", "comando": "ligar", "grupo": 1}, {"id": "l2", "comando": "ligar", "grupo": 2}],
+])
+def test_executar_rotina_repassa_o_timeout(caminho_config, rotina):
+    hub = HubAutomacao(caminho_config(DISPOSITIVOS, rotinas={"r": rotina}))
+    resultado = hub.executar_rotina("r", timeout=0)
+
+    assert resultado.expirou and not resultado.sucesso
+    assert resultado.passos[-1].status == "cancelado"
+    assert hub.get_dispositivo("l2").state == "off"
@@ -0,0 +1,77 @@
+# smart_home/benchmarks/carregamento.py
+"""
+Mede o tempo de inicialização e o pico de memória do HubAutomacao com carregamento
+completo e com carregamento preguiçoso (DispositivoStub), para configurações sintéticas.
+
+Uso (a partir da pasta que contém o pacote smart_home):
+    python -m smart_home.benchmarks.carregamento --quantidades 1000 10000 100000 [--variado]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from smart_home.core.hub import HubAutomacao
+from smart_home.benchmarks.dados import gerar_configuracao
+
+
+def _iniciar(caminho: str, preguicoso: bool) -> HubAutomacao:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return HubAutomacao(caminho, carregamento_preguicoso=preguicoso)
+
+
+def medir(caminho: str, preguicoso: bool):
+    """
+    Retorna (segundos para iniciar, pico de memória, memória retida após iniciar, segundos para
+    listar + salvar). O tempo é medido sem o tracemalloc, que deixa a alocação bem mais lenta.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    hub = _iniciar(caminho, preguicoso)
+    duracao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        hub.listar_dispositivos()
+        hub.exportar_configuracao(caminho + ".saida.json")
+    salvar = time.perf_counter() - inicio
+    del hub
+
+    gc.collect()
+    tracemalloc.start()
+    hub = _iniciar(caminho, preguicoso)
+    pico = tracemalloc.get_traced_memory()[1]
+    # A coleta completa também esvazia as listas de reaproveitamento do interpretador (tuplas
+    # temporárias, por exemplo), que não pertencem ao hub
+    gc.collect()
+    retido = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return duracao, pico, retido, salvar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do carregamento da configuração")
+    parser.add_argument("--quantidades", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--variado", action="store_true",
+                        help="Atributos sorteados por dispositivo (brilho, potencia_w, consumo_wh) em vez de fixos.")
+    args = parser.parse_args()
+
+    print(f"{'dispositivos':>12} | {'modo':<11} | {'inicio (s)':>10} | {'pico (MB)':>9} | {'retido (MB)':>11} | "
+          f"{'listar+salvar (s)':>17}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for quantidade in args.quantidades:
+            caminho = os.path.join(pasta, f"config_{quantidade}.json")
+            gerar_configuracao(caminho, quantidade, variado=args.variado)
+            for preguicoso in (False, True):
+                duracao, pico, retido, salvar = medir(caminho, preguicoso)
+                modo = "preguiçoso" if preguicoso else "completo"
+                print(f"{quantidade:>12} | {modo:<11} | {duracao:>10.3f} | {pico / 2**20:>9.1f} | "
+                      f"{retido / 2**20:>11.1f} | {salvar:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
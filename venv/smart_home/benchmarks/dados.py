@@ -0,0 +1,89 @@
+# smart_home/benchmarks/dados.py
+"""Geração de configurações e logs de eventos sintéticos para os benchmarks."""
+import csv
+import json
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+from smart_home.core.logger import CABECALHO
+
+# (tipo, estado, atributos) usados em rodízio na configuração gerada
+MODELOS = [
+    ("LIGHT", "off", {"brilho": 50, "cor": "NEUTRA"}),
+    ("OUTLET", "off", {"potencia_w": 100, "consumo_wh": 0}),
+    ("DOOR", "trancada", {"tentativas_invalidas": 0}),
+    ("ALARM", "off", {}),
+    ("TV", "off", {"potencia_w": 120, "consumo_wh": 0}),
+    ("MICROWAVE", "off", {"potencia_w": 1200, "consumo_wh": 0}),
+]
+
+
+def ids_dispositivos(quantidade: int, sem_portas: bool = False) -> List[str]:
+    """IDs na mesma ordem de gerar_configuracao. Sem portas, todos aceitam ligar/desligar a partir de 'off'."""
+    ids = []
+    for i in range(quantidade):
+        tipo = MODELOS[i % len(MODELOS)][0]
+        if not (sem_portas and tipo == "DOOR"):
+            ids.append(f"{tipo.lower()}_{i}")
+    return ids
+
+
+def gerar_rotinas(quantidade: int, passos: int = 20) -> dict:
+    """
+    Duas rotinas com os mesmos passos (liga e depois desliga `passos // 2` dispositivos):
+    'sequencial' no formato antigo e 'paralela' com grupos, para comparar as duas execuções.
+    """
+    alvos = ids_dispositivos(quantidade, sem_portas=True)[:passos // 2]
+    sequencial = [{"id": id_dev, "comando": c} for c in ("ligar", "desligar") for id_dev in alvos]
+    paralela = [{"id": id_dev, "comando": c, "grupo": g} for g, c in enumerate(("ligar", "desligar")) for id_dev in alvos]
+    return {"sequencial": sequencial, "paralela": paralela}
+
+
+def _variar(atributos: dict, aleatorio: random.Random) -> dict:
+    """Sorteia brilho, potência e consumo, como numa casa real em que cada aparelho tem os seus."""
+    variados = dict(atributos)
+    if "brilho" in variados:
+        variados["brilho"] = aleatorio.randint(0, 100)
+    if "potencia_w" in variados:
+        variados["potencia_w"] = aleatorio.randint(5, 2000)
+    if "consumo_wh" in variados:
+        variados["consumo_wh"] = round(aleatorio.uniform(0, 50000), 2)
+    return variados
+
+
+def gerar_configuracao(caminho: str, quantidade: int, com_rotinas: bool = False, variado: bool = False,
+                       semente: int = 42):
+    """Com `variado`, cada dispositivo recebe atributos sorteados em vez dos valores fixos de MODELOS."""
+    aleatorio = random.Random(semente)
+    dispositivos = []
+    for i in range(quantidade):
+        tipo, estado, atributos = MODELOS[i % len(MODELOS)]
+        dispositivos.append({"id": f"{tipo.lower()}_{i}", "tipo": tipo, "nome": f"{tipo} {i}", "estado": estado,
+                             "atributos": _variar(atributos, aleatorio) if variado else dict(atributos)})
+    rotinas = gerar_rotinas(quantidade) if com_rotinas else {}
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"hub": {"nome": "Benchmark", "versao": "1.0"}, "dispositivos": dispositivos, "rotinas": rotinas}, f)
+
+
+def gerar_eventos(caminho: str, quantidade_dispositivos: int, quantidade_eventos: int, semente: int = 42):
+    """
+    Grava um eventos.csv em ordem cronológica, alternando ligar/desligar em dispositivos
+    sorteados da configuração de mesmo tamanho (portas ficam de fora).
+    """
+    aleatorio = random.Random(semente)
+    ids = ids_dispositivos(quantidade_dispositivos, sem_portas=True)
+    ligados = set()
+    momento = datetime(2025, 1, 1)
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CABECALHO)
+        for _ in range(quantidade_eventos):
+            id_dev = aleatorio.choice(ids)
+            momento += timedelta(seconds=aleatorio.randint(1, 120))
+            if id_dev in ligados:
+                ligados.discard(id_dev)
+                writer.writerow([momento.isoformat(), id_dev, "desligar", "on", "off"])
+            else:
+                ligados.add(id_dev)
+                writer.writerow([momento.isoformat(), id_dev, "ligar", "off", "on"])
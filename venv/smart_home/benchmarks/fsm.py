@@ -0,0 +1,97 @@
+# smart_home/benchmarks/fsm.py
+"""
+Compara a FSM compartilhada por classe (core/fsm.py) com o modelo antigo,
+em que cada dispositivo criava o seu próprio `transitions.Machine`.
+
+Uso (a partir da pasta que contém o pacote smart_home):
+    python -m smart_home.benchmarks.fsm --quantidade 10000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from transitions import Machine
+
+from smart_home.dispositivos.luz import Luz
+from smart_home.dispositivos.tomada import Tomada
+from smart_home.dispositivos.porta import Porta
+from smart_home.dispositivos.alarme import Alarme
+from smart_home.dispositivos.tv import Tv
+from smart_home.dispositivos.microondas import Microondas
+
+CLASSES = [Luz, Tomada, Porta, Alarme, Tv, Microondas]
+
+
+def _classe_legada(classe):
+    """Cria um modelo equivalente ao antigo: atributos em __dict__ e um Machine por instância."""
+    metodos = {
+        nome: valor for nome, valor in vars(classe).items()
+        if callable(valor) and (nome.startswith(('on_enter_', 'on_exit_')) or nome.startswith(('validar_', 'pode_')))
+    }
+
+    def __init__(self, id, nome):
+        self._id = id
+        self._nome = nome
+        self._brilho = 50
+        self._potencia_w = 100
+        self._consumo_wh = 0
+        self._hora_ligada = None
+        self.tentativas_invalidas = 0
+        self.maquina = Machine(
+            model=self,
+            states=classe.estados,
+            transitions=classe.transicoes,
+            initial=classe.estados[0],
+            auto_transitions=False
+        )
+
+    return type(f"{classe.__name__}Legado", (), {'__init__': __init__, **metodos})
+
+
+def _criar_novo(classe, i):
+    if classe in (Tomada, Tv, Microondas):
+        return classe(f"{classe.__name__}_{i}", "bench", potencia_w=100)
+    return classe(f"{classe.__name__}_{i}", "bench")
+
+
+def medir(fabrica, quantidade: int):
+    """
+    Retorna (segundos para construir, bytes alocados por dispositivo). O tempo é medido numa
+    execução sem o tracemalloc, que deixa a alocação bem mais lenta.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    dispositivos = [fabrica(i) for i in range(quantidade)]
+    duracao = time.perf_counter() - inicio
+    del dispositivos
+
+    gc.collect()
+    tracemalloc.start()
+    inicio_mem = tracemalloc.get_traced_memory()[0]
+    dispositivos = [fabrica(i) for i in range(quantidade)]
+    memoria = tracemalloc.get_traced_memory()[0] - inicio_mem
+    tracemalloc.stop()
+    del dispositivos
+    return duracao, memoria / quantidade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da FSM compartilhada vs transitions.Machine por instância")
+    parser.add_argument('--quantidade', type=int, default=5000, help='Dispositivos criados por classe.')
+    args = parser.parse_args()
+
+    print(f"{'classe':<12} {'modelo':<10} {'tempo (s)':>10} {'us/disp':>9} {'bytes/disp':>11}")
+    for classe in CLASSES:
+        legada = _classe_legada(classe)
+        resultados = [
+            ('machine', medir(lambda i: legada(f"l_{i}", "bench"), args.quantidade)),
+            ('compartilh', medir(lambda i: _criar_novo(classe, i), args.quantidade)),
+        ]
+        for modelo, (duracao, por_dispositivo) in resultados:
+            print(f"{classe.__name__:<12} {modelo:<10} {duracao:>10.4f} "
+                  f"{duracao / args.quantidade * 1e6:>9.2f} {por_dispositivo:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# smart_home/benchmarks/suite.py
+"""
+Suíte de benchmarks do hub, em várias escalas, com configurações e eventos.csv sintéticos:
+  - carregar_configuracao / salvar_configuracao
+  - vazão do executar_comando (sem observers, com observers e com instrumentação)
+  - latência do executar_rotina (rotina sequencial e a mesma com passos em paralelo)
+  - eventos/s do CSVLogger (modo direto e bufferizado)
+  - tempo de cada função de relatorios
+
+Uso (a partir da pasta que contém o pacote smart_home):
+    python -m smart_home.benchmarks.suite --escalas 1000 10000 --saida resultados.json
+
+Com --saida, os resultados são gravados em JSON para comparar execuções e achar regressões.
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from smart_home.benchmarks.dados import gerar_configuracao, gerar_eventos, ids_dispositivos
+from smart_home.core import relatorios
+from smart_home.core.eventos import Evento, TipoEvento
+from smart_home.core.hub import HubAutomacao
+from smart_home.core.logger import CSVLogger
+from smart_home.core.metricas import formatar_metricas
+
+
+@contextlib.contextmanager
+def _silencioso():
+    """O hub imprime a cada comando; a saída vai para /dev/null durante as medições."""
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+def _cronometrar(funcao: Callable[[], Any], repeticoes: int = 1) -> float:
+    """Menor tempo (s) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def _novo_logger(caminho: str, **kwargs) -> CSVLogger:
+    # CSVLogger é um singleton; o benchmark precisa de instâncias novas com outras configurações
+    CSVLogger._instance = None
+    return CSVLogger(caminho, **kwargs)
+
+
+def medir_configuracao(caminho: str, repeticoes: int) -> Dict[str, float]:
+    with _silencioso():
+        carregar = _cronometrar(lambda: HubAutomacao(caminho), repeticoes)
+        hub = HubAutomacao(caminho)
+        salvar = _cronometrar(hub.salvar_configuracao, repeticoes)
+    return {"carregar_configuracao_s": carregar, "salvar_configuracao_s": salvar}
+
+
+def _vazao_comandos(hub: HubAutomacao, ids: List[str], comandos: int) -> float:
+    """Comandos/s ligando e depois desligando `comandos // 2` dispositivos (todos voltam para 'off')."""
+    alvos = ids[:max(1, comandos // 2)]
+    inicio = time.perf_counter()
+    with _silencioso():
+        for comando in ("ligar", "desligar"):
+            for id_dev in alvos:
+                hub.executar_comando(id_dev, comando)
+    return 2 * len(alvos) / (time.perf_counter() - inicio)
+
+
+def medir_comandos(caminho: str, pasta: str, quantidade: int, comandos: int) -> Dict[str, Any]:
+    ids = ids_dispositivos(quantidade, sem_portas=True)
+    logger = _novo_logger(os.path.join(pasta, "eventos_comandos.csv"), bufferizado=True)
+    with _silencioso():
+        hub = HubAutomacao(caminho)
+        # Mesmos observers nos dois hubs, para que a diferença entre eles seja o custo da instrumentação
+        hub_observado = HubAutomacao(caminho)
+        hub_instrumentado = HubAutomacao(caminho, instrumentacao=True)
+        for h in (hub_observado, hub_instrumentado):
+            h.adicionar_observer(logger)
+            h.adicionar_observer(relatorios.RelatoriosObserver())
+
+    resultado = {
+        "executar_comando_por_s": _vazao_comandos(hub, ids, comandos),
+        "executar_comando_com_observers_por_s": _vazao_comandos(hub_observado, ids, comandos),
+        "executar_comando_instrumentado_por_s": _vazao_comandos(hub_instrumentado, ids, comandos),
+    }
+    with _silencioso():
+        for nome in hub_instrumentado.listar_rotinas():
+            hub_instrumentado.executar_rotina(nome)
+    logger.close()
+    resultado["metricas_instrumentado"] = hub_instrumentado.metricas()
+    return resultado
+
+
+def medir_rotinas(caminho: str, repeticoes: int) -> Dict[str, float]:
+    with _silencioso():
+        hub = HubAutomacao(caminho)
+        resultado = {}
+        for nome in ("sequencial", "paralela"):
+            latencias = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                hub.executar_rotina(nome)
+                latencias.append(time.perf_counter() - inicio)
+            resultado[f"executar_rotina_{nome}_p50_ms"] = statistics.median(latencias) * 1000
+            resultado[f"executar_rotina_{nome}_max_ms"] = max(latencias) * 1000
+    return resultado
+
+
+def medir_logger(pasta: str, eventos: int) -> Dict[str, float]:
+    lote = [
+        Evento(TipoEvento.COMANDO_EXECUTADO, id_dispositivo=f"luz_{i}",
+               detalhes={"comando": "ligar", "estado_antes": "off", "estado_depois": "on"})
+        for i in range(eventos)
+    ]
+    resultado = {}
+    # O modo direto abre o arquivo a cada evento, então usa uma amostra menor
+    for modo, bufferizado, amostra in (("direto", False, lote[:min(eventos, 5000)]), ("bufferizado", True, lote)):
+        caminho = os.path.join(pasta, f"eventos_logger_{modo}.csv")
+        logger = _novo_logger(caminho, bufferizado=bufferizado)
+        inicio = time.perf_counter()
+        for evento in amostra:
+            logger.update(evento)
+        logger.close()  # inclui a gravação do que ainda estava no buffer
+        resultado[f"csvlogger_{modo}_eventos_por_s"] = len(amostra) / (time.perf_counter() - inicio)
+    CSVLogger._instance = None
+    return resultado
+
+
+def medir_relatorios(caminho_config: str, caminho_eventos: str, repeticoes: int) -> Dict[str, float]:
+    with _silencioso():
+        dispositivos = HubAutomacao(caminho_config).listar_dispositivos()
+    eventos = relatorios.carregar_eventos(caminho_eventos)
+    funcoes = {
+        "carregar_eventos": lambda: relatorios.carregar_eventos(caminho_eventos),
+        "relatorio_tempo_luz_ligada": lambda: relatorios.relatorio_tempo_luz_ligada(eventos, dispositivos),
+        "relatorio_consumo_tomada": lambda: relatorios.relatorio_consumo_tomada(eventos, dispositivos),
+        "relatorio_dispositivos_mais_usados": lambda: relatorios.relatorio_dispositivos_mais_usados(eventos),
+        "relatorio_distribuicao_comandos_por_tipo":
+            lambda: relatorios.relatorio_distribuicao_comandos_por_tipo(eventos, dispositivos),
+        "relatorio_tentativas_invalidas_porta": lambda: relatorios.relatorio_tentativas_invalidas_porta(dispositivos),
+        "gerar_relatorios": lambda: relatorios.gerar_relatorios(dispositivos, caminho_eventos),
+        "RelatoriosObserver.carregar": lambda: relatorios.RelatoriosObserver.carregar(
+            os.path.join(os.path.dirname(caminho_eventos), "sem_checkpoint.json"), caminho_eventos),
+    }
+    with _silencioso():
+        return {f"{nome}_s": _cronometrar(funcao, repeticoes) for nome, funcao in funcoes.items()}
+
+
+def executar(escala: int, pasta: str, repeticoes: int, eventos_por_dispositivo: int) -> Dict[str, Any]:
+    caminho_config = os.path.join(pasta, f"config_{escala}.json")
+    caminho_eventos = os.path.join(pasta, f"eventos_{escala}.csv")
+    gerar_configuracao(caminho_config, escala, com_rotinas=True)
+    gerar_eventos(caminho_eventos, escala, escala * eventos_por_dispositivo)
+
+    resultado: Dict[str, Any] = {"dispositivos": escala, "eventos_csv": escala * eventos_por_dispositivo}
+    resultado.update(medir_configuracao(caminho_config, repeticoes))
+    resultado.update(medir_comandos(caminho_config, pasta, escala, comandos=min(escala, 20000)))
+    resultado.update(medir_rotinas(caminho_config, repeticoes=max(repeticoes, 5)))
+    resultado.update(medir_logger(pasta, eventos=min(escala * eventos_por_dispositivo, 100000)))
+    resultado.update(medir_relatorios(caminho_config, caminho_eventos, repeticoes))
+    return resultado
+
+
+def imprimir(resultado: Dict[str, Any]):
+    print(f"\n=== {resultado['dispositivos']} dispositivos, {resultado['eventos_csv']} eventos no CSV ===")
+    for chave, valor in resultado.items():
+        if chave in ("dispositivos", "eventos_csv", "metricas_instrumentado"):
+            continue
+        print(f"  {chave:<48} {valor:>14.4f}" if isinstance(valor, float) else f"  {chave:<48} {valor:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Smart Home Hub")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--eventos-por-dispositivo", type=int, default=10)
+    parser.add_argument("--saida", type=str, help="Arquivo JSON para gravar os resultados.")
+    parser.add_argument("--metricas", action="store_true",
+                        help="Mostra também as métricas coletadas pelo hub instrumentado.")
+    args = parser.parse_args()
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for escala in args.escalas:
+            resultado = executar(escala, pasta, args.repeticoes, args.eventos_por_dispositivo)
+            imprimir(resultado)
+            if args.metricas:
+                print(formatar_metricas(resultado["metricas_instrumentado"]))
+            resultados.append(resultado)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados gravados em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# smart_home/core/barramento.py
+"""
+Despacho assíncrono de eventos: cada observer ganha uma fila limitada e uma thread própria,
+de modo que um observer lento (ex.: CSVLogger fazendo I/O) não atrasa o comando que gerou o evento.
+"""
+import time
+from collections import deque
+from enum import Enum
+from threading import Condition, Thread
+from typing import Callable, Dict, Hashable, List, Optional
+
+from .eventos import Evento
+from .observers import Observer
+
+
+class PoliticaOverflow(Enum):
+    BLOQUEAR = "bloquear"              # quem notifica espera até abrir espaço na fila
+    DESCARTAR_ANTIGO = "descartar_antigo"  # descarta o evento mais antigo da fila
+    # Com a fila cheia, descarta o evento pendente de mesma chave (ex.: mesmo dispositivo) e enfileira
+    # o novo no fim; sem chave igual pendente, descarta o mais antigo. Abaixo do limite nada é mesclado.
+    COALESCER = "coalescer"
+
+
+def chave_por_dispositivo(evento: Evento) -> Hashable:
+    return (evento.tipo, evento.id_dispositivo)
+
+
+class FilaObserver(Observer):
+    """
+    Envolve um observer com uma fila limitada e uma thread que entrega os eventos em ordem.
+    Lotes (update_lote) entram na fila como um único item e chegam inteiros ao update_lote do
+    observer (com COALESCER e sem espaço para o lote, os eventos entram um a um); o limite
+    `tamanho_max` conta eventos, não itens.
+    """
+
+    def __init__(self, observer: Observer, tamanho_max: int = 1000,
+                 politica: PoliticaOverflow = PoliticaOverflow.BLOQUEAR,
+                 chave: Callable[[Evento], Hashable] = chave_por_dispositivo):
+        if tamanho_max < 1:
+            raise ValueError("tamanho_max deve ser >= 1")
+        self.observer = observer
+        self.tamanho_max = tamanho_max
+        self.politica = politica
+        self.chave = chave
+        self._fila = deque()  # itens [momento_enfileirado, evento ou lista de eventos, chave]
+        self._por_chave: Dict[Hashable, list] = {}  # item pendente de cada chave (política COALESCER)
+        self._pendentes = 0  # eventos na fila
+        self._condicao = Condition()
+        self._em_entrega = False
+        self._encerrando = False
+        self.entregues = 0
+        self.descartados = 0
+        self.coalescidos = 0
+        self.erros = 0
+        self._thread = Thread(target=self._loop, name=f"Observer-{self.nome}", daemon=True)
+        self._thread.start()
+
+    @property
+    def nome(self) -> str:
+        return getattr(self.observer, "nome", type(self.observer).__name__)
+
+    @staticmethod
+    def _tamanho(item: list) -> int:
+        return len(item[1]) if isinstance(item[1], list) else 1
+
+    def _verificar_aberta(self):
+        if self._encerrando:
+            raise RuntimeError(f"Fila do observer {self.nome} já foi encerrada.")
+
+    def _abrir_espaco(self, quantidade: int, chave: Optional[Hashable] = None):
+        if self.politica == PoliticaOverflow.BLOQUEAR:
+            # Um lote maior que a fila só espera a fila esvaziar
+            while self._pendentes and self._pendentes + quantidade > self.tamanho_max:
+                self._condicao.wait()
+            return
+        if self._pendentes + quantidade <= self.tamanho_max:
+            return
+        if chave is not None:
+            pendente = self._por_chave.pop(chave, None)
+            if pendente is not None:
+                # Busca por identidade, O(tamanho_max), mas só quando a fila está cheia
+                for i, item in enumerate(self._fila):
+                    if item is pendente:
+                        del self._fila[i]
+                        break
+                self._pendentes -= 1
+                self.coalescidos += 1
+                return
+        while self._fila and self._pendentes + quantidade > self.tamanho_max:
+            item = self._fila.popleft()
+            self._retirado(item)
+            self.descartados += self._tamanho(item)
+
+    def _retirado(self, item: list):
+        self._pendentes -= self._tamanho(item)
+        if item[2] is not None and self._por_chave.get(item[2]) is item:
+            del self._por_chave[item[2]]
+
+    def update(self, evento: Evento):
+        with self._condicao:
+            self._verificar_aberta()
+            self._enfileirar(evento)
+            self._condicao.notify_all()
+
+    def _enfileirar(self, evento: Evento):
+        chave = self.chave(evento) if self.politica == PoliticaOverflow.COALESCER else None
+        self._abrir_espaco(1, chave)
+        item = [time.monotonic(), evento, chave]
+        if chave is not None:
+            self._por_chave[chave] = item
+        self._fila.append(item)
+        self._pendentes += 1
+
+    def update_lote(self, eventos: List[Evento]):
+        if not eventos:
+            return
+        with self._condicao:
+            self._verificar_aberta()
+            if self.politica == PoliticaOverflow.COALESCER and self._pendentes + len(eventos) > self.tamanho_max:
+                # Sem espaço para o lote inteiro: cada evento é coalescido (ou descarta o mais antigo) sozinho
+                for evento in eventos:
+                    self._enfileirar(evento)
+            else:
+                self._abrir_espaco(len(eventos))
+                self._fila.append([time.monotonic(), list(eventos), None])
+                self._pendentes += len(eventos)
+            self._condicao.notify_all()
+
+    def _loop(self):
+        while True:
+            with self._condicao:
+                while not self._fila and not self._encerrando:
+                    self._condicao.wait()
+                if not self._fila:
+                    return
+                item = self._fila.popleft()
+                self._retirado(item)
+                self._em_entrega = True
+                self._condicao.notify_all()
+            _, carga, _ = item
+            entregue = False
+            try:
+                if isinstance(carga, list):
+                    self.observer.update_lote(carga)
+                else:
+                    self.observer.update(carga)
+                entregue = True
+            except Exception as e:
+                print(f"[ERRO NO OBSERVER {self.nome}]: {e}")
+            with self._condicao:
+                self._em_entrega = False
+                # Os dois contadores são em eventos (um lote que falha conta todos os seus eventos)
+                if entregue:
+                    self.entregues += self._tamanho(item)
+                else:
+                    self.erros += self._tamanho(item)
+                self._condicao.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Espera até todos os eventos enfileirados serem entregues. Retorna False se estourar o timeout."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicao:
+            while self._fila or self._em_entrega:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._condicao.wait(restante)
+        return True
+
+    def encerrar(self):
+        """Entrega o que falta na fila e finaliza a thread."""
+        with self._condicao:
+            self._encerrando = True
+            self._condicao.notify_all()
+        self._thread.join()
+
+    def estatisticas(self) -> Dict[str, float]:
+        with self._condicao:
+            pendentes = self._pendentes
+            atraso = time.monotonic() - self._fila[0][0] if self._fila else 0.0
+            return {
+                "pendentes": pendentes,
+                "atraso_s": round(atraso, 6),
+                "entregues": self.entregues,
+                "descartados": self.descartados,
+                "coalescidos": self.coalescidos,
+                "erros": self.erros,
+            }
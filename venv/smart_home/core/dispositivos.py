@@ -0,0 +1,124 @@
+
+from abc import ABC, abstractmethod
+from enum import Enum
+from .fsm import MaquinaCompilada
+
+class TipoDispositivo(Enum):
+    DOOR = "PORTA"
+    LIGHT = "LUZ"
+    OUTLET = "TOMADA"
+    ALARM = "ALARME"
+    MICROWAVE = "MICROONDAS"
+    TV = "TV"
+
+class Dispositivo(ABC):
+    # Cada instância guarda só o índice do estado; a FSM é compartilhada pela classe (ver core/fsm.py)
+    __slots__ = ('_id', '_nome', '_tipo', '_estado', '_indice')
+
+    estados: list = []
+    transicoes: list = []
+    maquina: MaquinaCompilada
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.estados:
+            cls.maquina = MaquinaCompilada(cls, cls.estados, cls.transicoes)
+            cls.maquina.instalar()
+
+    def __init__(self, id: str, nome: str, tipo: TipoDispositivo):
+        self._id = id
+        self._nome = nome
+        self._tipo = tipo
+        self._estado = None
+        self._indice = None  # IndiceDispositivos do hub ao qual o dispositivo pertence (ver core/indices.py)
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @property
+    def tipo(self):
+        return self._tipo
+
+    @property
+    def state(self) -> str:
+        return self.maquina.estados[self._estado]
+
+    @state.setter
+    def state(self, estado: str):
+        # Atribuição direta (sem callbacks), como ao restaurar o estado salvo no JSON
+        self._definir_estado(self.maquina.indice(estado))
+
+    def _definir_estado(self, idx: int):
+        antes, self._estado = self._estado, idx
+        if self._indice is not None and antes != idx:
+            self._indice.mudou_estado(self, antes, idx)
+
+    def trigger(self, nome: str, *args, **kwargs) -> bool:
+        return self.maquina.disparar(self, nome, args, kwargs)
+
+    @abstractmethod
+    def get_estado_dict(self) -> dict:
+        pass
+
+    def __str__(self):
+        # self.state é resolvido pela FSM compartilhada da classe
+        return f"{self.id} | {self.tipo.value} | {self.state}"
+
+class DispositivoStub:
+    """
+    Representação leve de um dispositivo lido da configuração, usada no carregamento preguiçoso.
+    Guarda só os campos do registro (id, tipo, nome, estado, atributos), sem o dict original;
+    o objeto completo (Luz, Tomada, ...) só é criado pelo hub quando o dispositivo é usado
+    pela primeira vez, e os valores dos atributos só são validados nessa hora.
+    """
+    __slots__ = ('_id', '_tipo', '_nome', '_estado', '_atributos', '_indice')
+
+    def __init__(self, dados: dict):
+        # Só os campos necessários para listar/indexar são conferidos agora (KeyError se faltarem)
+        self._id = dados["id"]
+        self._tipo = TipoDispositivo[dados["tipo"]]
+        self._nome = dados["nome"]
+        self._estado = dados["estado"]
+        self._atributos = dados.get("atributos") or None  # dicts vazios não são guardados
+        self._indice = None
+
+    @property
+    def dados(self) -> dict:
+        """Registro no formato do configuracao.json (usado para hidratar e para salvar)."""
+        return {"id": self._id, "tipo": self._tipo.name, "nome": self._nome, **self.get_estado_dict()}
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @property
+    def tipo(self):
+        return self._tipo
+
+    @property
+    def state(self) -> str:
+        return self._estado
+
+    # Mesmos valores padrão usados pelo hub ao criar o objeto completo
+    @property
+    def potencia_w(self):
+        return (self._atributos or {}).get("potencia_w", 100)
+
+    @property
+    def tentativas_invalidas(self):
+        return 0  # o hub não restaura o contador ao criar a Porta
+
+    def get_estado_dict(self) -> dict:
+        return {"estado": self._estado, "atributos": dict(self._atributos or {})}
+
+    def __str__(self):
+        return f"{self.id} | {self.tipo.value} | {self.state}"
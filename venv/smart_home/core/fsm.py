@@ -0,0 +1,173 @@
+# smart_home/core/fsm.py
+"""
+Máquina de estados compartilhada entre todas as instâncias de uma classe de dispositivo.
+
+A tabela `transicoes` de cada classe é compilada uma única vez (em `Dispositivo.__init_subclass__`)
+para um dicionário trigger -> índice do estado de origem -> transições candidatas. Cada instância
+guarda apenas o índice do estado atual, em vez de um `transitions.Machine` próprio.
+
+O comportamento segue o da biblioteca `transitions` (com `auto_transitions=False`):
+triggers, `may_<trigger>`, `is_<estado>`, `conditions`/`unless`, `before`/`after`
+e os callbacks `on_exit_<estado>` / `on_enter_<estado>`.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .erros import TransicaoInvalidaError
+
+Callback = Union[str, Callable[..., Any]]
+
+
+def _como_tupla(valor) -> tuple:
+    if valor is None:
+        return ()
+    if isinstance(valor, (list, tuple)):
+        return tuple(valor)
+    return (valor,)
+
+
+def _resolver(classe, callback: Callback) -> Callable[..., Any]:
+    """Converte um callback (nome de método ou função) em função chamável com a instância."""
+    if callable(callback):
+        return lambda modelo, *args, **kwargs: callback(*args, **kwargs)
+    funcao = getattr(classe, callback, None)
+    if callable(funcao):
+        return funcao
+    # Atributos/properties são avaliados na instância, como faz a biblioteca `transitions`
+    return lambda modelo, *args, **kwargs: getattr(modelo, callback)
+
+
+class Transicao:
+    __slots__ = ('trigger', 'origem', 'destino', 'condicoes', 'exceto', 'antes', 'depois')
+
+    def __init__(self, trigger: str, origem: int, destino: Optional[int],
+                 condicoes: tuple, exceto: tuple, antes: tuple, depois: tuple):
+        self.trigger = trigger
+        self.origem = origem
+        self.destino = destino  # None indica transição interna (sem on_exit/on_enter)
+        self.condicoes = condicoes
+        self.exceto = exceto
+        self.antes = antes
+        self.depois = depois
+
+    def pode_executar(self, modelo, args, kwargs) -> bool:
+        for condicao in self.condicoes:
+            if not condicao(modelo, *args, **kwargs):
+                return False
+        for condicao in self.exceto:
+            if condicao(modelo, *args, **kwargs):
+                return False
+        return True
+
+
+class MaquinaCompilada:
+    """Tabela de transições de uma classe de dispositivo, compilada uma única vez."""
+
+    def __init__(self, classe, estados: Sequence[str], transicoes: List[Dict[str, Any]]):
+        self.classe = classe
+        self.estados: Tuple[str, ...] = tuple(estados)
+        self.indices: Dict[str, int] = {nome: i for i, nome in enumerate(self.estados)}
+        self.ao_entrar: Tuple[tuple, ...] = tuple(
+            _como_tupla(_resolver(classe, f"on_enter_{nome}") if hasattr(classe, f"on_enter_{nome}") else None)
+            for nome in self.estados
+        )
+        self.ao_sair: Tuple[tuple, ...] = tuple(
+            _como_tupla(_resolver(classe, f"on_exit_{nome}") if hasattr(classe, f"on_exit_{nome}") else None)
+            for nome in self.estados
+        )
+        # trigger -> índice do estado de origem -> transições candidatas (na ordem da tabela)
+        self.tabela: Dict[str, Dict[int, List[Transicao]]] = {}
+        for definicao in transicoes:
+            self._compilar(definicao)
+
+    def _compilar(self, definicao: Dict[str, Any]):
+        trigger = definicao['trigger']
+        origens = definicao['source']
+        if origens == '*':
+            origens = self.estados
+        destino = definicao.get('dest')
+
+        def callbacks(chave):
+            return tuple(_resolver(self.classe, c) for c in _como_tupla(definicao.get(chave)))
+
+        condicoes, exceto = callbacks('conditions'), callbacks('unless')
+        antes, depois = callbacks('before'), callbacks('after')
+        por_origem = self.tabela.setdefault(trigger, {})
+        for origem in _como_tupla(origens):
+            idx_origem = self.indice(origem)
+            if destino is None:
+                idx_destino = None
+            elif destino == '=':
+                idx_destino = idx_origem
+            else:
+                idx_destino = self.indice(destino)
+            por_origem.setdefault(idx_origem, []).append(
+                Transicao(trigger, idx_origem, idx_destino, condicoes, exceto, antes, depois)
+            )
+
+    def indice(self, estado: str) -> int:
+        try:
+            return self.indices[estado]
+        except KeyError:
+            raise ValueError(f"Estado '{estado}' não existe para {self.classe.__name__}. Estados válidos: {list(self.estados)}")
+
+    def get_triggers(self, estado: str) -> List[str]:
+        """Lista os triggers que possuem transição a partir do estado informado."""
+        idx = self.indice(estado)
+        return [trigger for trigger, por_origem in self.tabela.items() if idx in por_origem]
+
+    def disparar(self, modelo, trigger: str, args: tuple, kwargs: dict) -> bool:
+        candidatas = self.tabela[trigger].get(modelo._estado)
+        if not candidatas:
+            raise TransicaoInvalidaError(
+                f"Não é possível disparar '{trigger}' a partir do estado '{self.estados[modelo._estado]}'."
+            )
+        for transicao in candidatas:
+            if not transicao.pode_executar(modelo, args, kwargs):
+                continue
+            for callback in transicao.antes:
+                callback(modelo, *args, **kwargs)
+            if transicao.destino is not None:
+                for callback in self.ao_sair[transicao.origem]:
+                    callback(modelo, *args, **kwargs)
+                modelo._definir_estado(transicao.destino)
+                for callback in self.ao_entrar[transicao.destino]:
+                    callback(modelo, *args, **kwargs)
+            for callback in transicao.depois:
+                callback(modelo, *args, **kwargs)
+            return True
+        return False
+
+    def pode_disparar(self, modelo, trigger: str, args: tuple, kwargs: dict) -> bool:
+        candidatas = self.tabela[trigger].get(modelo._estado, ())
+        return any(t.pode_executar(modelo, args, kwargs) for t in candidatas)
+
+    def instalar(self):
+        """Cria na classe os métodos `<trigger>`, `may_<trigger>` e `is_<estado>`."""
+        for trigger in self.tabela:
+            if trigger not in self.classe.__dict__:
+                setattr(self.classe, trigger, _metodo_trigger(trigger))
+            if f"may_{trigger}" not in self.classe.__dict__:
+                setattr(self.classe, f"may_{trigger}", _metodo_may(trigger))
+        for idx, nome in enumerate(self.estados):
+            if f"is_{nome}" not in self.classe.__dict__:
+                setattr(self.classe, f"is_{nome}", _metodo_is(idx))
+
+
+def _metodo_trigger(trigger: str):
+    def metodo(self, *args, **kwargs):
+        return self.maquina.disparar(self, trigger, args, kwargs)
+    metodo.__name__ = trigger
+    return metodo
+
+
+def _metodo_may(trigger: str):
+    def metodo(self, *args, **kwargs):
+        return self.maquina.pode_disparar(self, trigger, args, kwargs)
+    metodo.__name__ = f"may_{trigger}"
+    return metodo
+
+
+def _metodo_is(idx: int):
+    def metodo(self):
+        return self._estado == idx
+    return metodo
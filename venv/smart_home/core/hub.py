@@ -0,0 +1,452 @@
+
+import time
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .dispositivos import Dispositivo, DispositivoStub
+from .persistencia import carregar_de_json, salvar_em_json, JournalEstado
+from .erros import DispositivoNaoEncontradoError, ComandoInvalidoError, ConfiguracaoInvalidaError
+from .eventos import Evento, TipoEvento
+from .observers import Observer
+from .barramento import FilaObserver, PoliticaOverflow
+from .indices import IndiceDispositivos
+from .rotinas import ExecutorRotinas, ResultadoPasso, ResultadoRotina, usa_dependencias
+from .metricas import MetricasHub, ObserverMedido
+from .dispositivos import TipoDispositivo
+from smart_home.dispositivos.porta import Porta
+from smart_home.dispositivos.luz import Luz, Cor
+from smart_home.dispositivos.tomada import Tomada
+from smart_home.dispositivos.alarme import Alarme
+from smart_home.dispositivos.microondas import Microondas
+from smart_home.dispositivos.tv import Tv
+
+TIPO_CLASSE_MAP = {
+    TipoDispositivo.DOOR: Porta,
+    TipoDispositivo.LIGHT: Luz,
+    TipoDispositivo.OUTLET: Tomada,
+    TipoDispositivo.ALARM: Alarme,
+    TipoDispositivo.MICROWAVE: Microondas,
+    TipoDispositivo.TV: Tv,
+}
+
+class HubAutomacao:
+    def __init__(self, config_path: str, despacho_assincrono: bool = False, journal: JournalEstado = None,
+                 carregamento_preguicoso: bool = False, instrumentacao: bool = False):
+        self._dispositivos: Dict[str, Dispositivo] = {}
+        self._indice = IndiceDispositivos()  # por tipo e por (tipo, estado), atualizado pelas transições
+        self._rotinas: Dict[str, List[Dict]] = {}
+        self._observers: List[Observer] = []
+        self._config_path = config_path
+        # Com despacho assíncrono, cada observer recebe os eventos por uma fila própria (ver core/barramento.py)
+        self._despacho_assincrono = despacho_assincrono
+        # Com journal, cada alteração é acrescentada ao journal em vez de regravar o JSON inteiro (ver core/persistencia.py)
+        self._journal = journal
+        # No carregamento preguiçoso os dispositivos começam como DispositivoStub e viram objetos no primeiro uso
+        self._carregamento_preguicoso = carregamento_preguicoso
+        # Com instrumentação, latências de comandos, transições, observers e rotinas vão para metricas()
+        self._metricas = MetricasHub() if instrumentacao else None
+        self._lock_registro = RLock()
+        self._executor_rotinas = ExecutorRotinas(self._aplicar_comando)
+        self.carregar_configuracao()
+
+    def adicionar_observer(self, observer: Observer, tamanho_fila: int = 1000,
+                           politica: PoliticaOverflow = PoliticaOverflow.BLOQUEAR):
+        if self._metricas is not None:
+            observer = ObserverMedido(observer, self._metricas)
+        if self._despacho_assincrono:
+            observer = FilaObserver(observer, tamanho_max=tamanho_fila, politica=politica)
+        self._observers.append(observer)
+
+    def drain(self, timeout: float = None) -> bool:
+        """Espera até todos os eventos enfileirados serem entregues aos observers."""
+        entregue = True
+        for observer in self._observers:
+            if isinstance(observer, FilaObserver):
+                entregue = observer.drain(timeout) and entregue
+        return entregue
+
+    def estatisticas_observers(self) -> Dict[str, Dict[str, float]]:
+        """Atraso e contadores de entrega/descarte por observer (apenas no despacho assíncrono)."""
+        return {
+            f"{i}:{observer.nome}": observer.estatisticas()
+            for i, observer in enumerate(self._observers) if isinstance(observer, FilaObserver)
+        }
+
+    def metricas(self) -> Optional[Dict[str, Any]]:
+        """Resumo dos histogramas de latência (ver core/metricas.py), ou None sem instrumentação."""
+        return self._metricas.resumo() if self._metricas is not None else None
+
+    def zerar_metricas(self):
+        if self._metricas is not None:
+            self._metricas.zerar()
+
+    def encerrar_observers(self):
+        """Entrega os eventos pendentes e finaliza as threads dos observers assíncronos."""
+        for observer in self._observers:
+            if isinstance(observer, FilaObserver):
+                observer.encerrar()
+
+    def _notificar(self, evento: Evento): #XXX
+        for observer in self._observers:
+            observer.update(evento)
+
+    def _notificar_lote(self, eventos: List[Evento]):
+        if not eventos:
+            return
+        for observer in self._observers:
+            observer.update_lote(eventos)
+
+    def adicionar_dispositivo(self, dispositivo: Dispositivo):
+        # Sob o mesmo lock das alterações feitas pelas rotinas: uma compactação do journal percorre
+        # self._dispositivos e não pode ver o dicionário mudar no meio
+        with self._lock_registro:
+            if dispositivo.id in self._dispositivos:
+                raise ValueError(f"Dispositivo com ID '{dispositivo.id}' já existe.")
+            self._dispositivos[dispositivo.id] = dispositivo
+            self._indice.adicionar(dispositivo)
+            self.registrar_alteracao(dispositivo)
+        evento = Evento(TipoEvento.DISPOSITIVO_ADICIONADO, id_dispositivo=dispositivo.id, tipo_dispositivo=dispositivo.tipo.value)
+        self._notificar(evento)
+        print(f"dispositivo {dispositivo.id} adicionado.")
+
+    def remover_dispositivo(self, id_dispositivo: str):
+        with self._lock_registro:
+            dispositivo = self._dispositivos.pop(id_dispositivo, None)
+            if dispositivo is None:
+                raise DispositivoNaoEncontradoError(f"Dispositivo com ID '{id_dispositivo}' não encontrado.")
+            self._indice.remover(dispositivo)
+            if self._journal is not None:
+                self._journal.registrar_remocao(id_dispositivo)
+                self._compactar_se_necessario()
+        evento = Evento(TipoEvento.DISPOSITIVO_REMOVIDO, id_dispositivo=id_dispositivo, tipo_dispositivo=dispositivo.tipo.value)
+        self._notificar(evento)
+        print("dispositivo removido")
+
+    def get_dispositivo(self, id_dispositivo: str) -> Dispositivo:
+        dispositivo = self._dispositivos.get(id_dispositivo)
+        if not dispositivo:
+            raise DispositivoNaoEncontradoError(f"Dispositivo com ID '{id_dispositivo}' não encontrado.")
+        if isinstance(dispositivo, DispositivoStub):
+            dispositivo = self._hidratar(dispositivo)
+        return dispositivo
+
+    def _hidratar(self, stub: DispositivoStub) -> Dispositivo:
+        """Cria o objeto completo a partir do stub (erros de validação aparecem aqui) e o coloca no lugar dele."""
+        with self._lock_registro:
+            atual = self._dispositivos.get(stub.id)
+            if atual is None:
+                # Removido por outra thread entre a busca e a hidratação
+                raise DispositivoNaoEncontradoError(f"Dispositivo com ID '{stub.id}' não encontrado.")
+            if atual is not stub:
+                return atual  # outra thread (ex.: passo de rotina) já hidratou
+            dispositivo = self._criar_dispositivo(stub.dados)
+            self._indice.remover(stub)
+            self._dispositivos[dispositivo.id] = dispositivo
+            self._indice.adicionar(dispositivo)
+            return dispositivo
+
+    def listar_dispositivos(self, tipo: Optional[TipoDispositivo] = None, estado: Optional[str] = None) -> List[Dispositivo]:
+        """Lista os dispositivos, opcionalmente só os de um tipo e/ou estado (consulta pelos índices)."""
+        encontrados = self._indice.buscar(tipo, estado)
+        return list(self._dispositivos.values()) if encontrados is None else encontrados
+
+    def executar_em_massa(self, filtro: Union[Dict[str, Any], Callable[[Dispositivo], bool]],
+                          comando: str, args: dict = None) -> Dict[str, int]:
+        """
+        Executa `comando` em todos os dispositivos que atendem ao filtro.
+        `filtro` é um dict com "tipo" (TipoDispositivo ou nome) e/ou "estado", resolvido pelos índices,
+        ou uma função que recebe o dispositivo. O comando é validado uma vez por classe de dispositivo
+        e os eventos gerados são enviados aos observers em um único lote.
+        """
+        metricas = self._metricas
+        inicio = time.perf_counter() if metricas is not None else 0.0
+        if callable(filtro):
+            alvos = [d for d in self._dispositivos.values() if filtro(d)]
+        else:
+            tipo = filtro.get("tipo")
+            if isinstance(tipo, str):
+                tipo = TipoDispositivo[tipo]
+            alvos = self.listar_dispositivos(tipo, filtro.get("estado"))
+
+        resumo = {"alvos": len(alvos), "executados": 0, "ignorados": 0, "sem_suporte": 0}
+        metodos_por_classe = {}
+        eventos = []
+        alterados = []
+        try:
+            for dispositivo in alvos:
+                if isinstance(dispositivo, DispositivoStub):
+                    dispositivo = self._hidratar(dispositivo)
+                classe = type(dispositivo)
+                if classe not in metodos_por_classe:
+                    metodo = getattr(classe, comando, None)
+                    metodos_por_classe[classe] = (metodo, getattr(classe, f"may_{comando}", None)) if callable(metodo) else None
+                metodos = metodos_por_classe[classe]
+                if metodos is None:
+                    resumo["sem_suporte"] += 1
+                    continue
+                metodo, verificacao = metodos
+                if verificacao is not None and not verificacao(dispositivo):
+                    resumo["ignorados"] += 1
+                    continue
+
+                antes, depois, duracao_transicao, evento = self._transicionar(
+                    dispositivo, comando, metodo, args, registrar=False)
+                if antes != depois or comando.startswith("definir"):
+                    alterados.append(dispositivo)
+                if metricas is not None:
+                    chave = self._chave_transicao(dispositivo, comando)
+                    if chave is not None:
+                        metricas.registrar("transicao", chave, duracao_transicao)
+                if evento is not None:
+                    eventos.append(evento)
+                resumo["executados"] += 1
+        finally:
+            # Mesmo se um alvo falhar no meio (ex.: stub inválido), os já alterados vão para o journal
+            # (em uma única gravação, um fsync por lote) e chegam aos observers
+            with self._lock_registro:
+                self.registrar_alteracoes(alterados)
+            self._notificar_lote(eventos)
+
+        if alvos and resumo["sem_suporte"] == len(alvos):
+            raise ComandoInvalidoError(f"Nenhum dos dispositivos filtrados suporta o comando '{comando}'.")
+        if metricas is not None:
+            # Uma amostra por chamada: o lote inteiro, incluindo a entrega aos observers
+            metricas.registrar("comando", f"{comando} (massa)", time.perf_counter() - inicio)
+        print(f"Comando '{comando}' em massa: {resumo['executados']} executados, {resumo['ignorados']} ignorados, "
+              f"{resumo['sem_suporte']} sem suporte (de {resumo['alvos']}).")
+        return resumo
+        
+    def listar_rotinas(self) -> list[str]:
+        return list(self._rotinas.keys())
+
+    def _aplicar_comando(self, id_dispositivo: str, comando: str, args: dict = None) -> Optional[Tuple[str, str]]:
+        """
+        Executa o comando sem imprimir nada. Retorna (estado_antes, estado_depois), ou None se o
+        comando não for uma transição válida no estado atual.
+        """
+        inicio = time.perf_counter() if self._metricas is not None else 0.0
+        dispositivo = self.get_dispositivo(id_dispositivo)
+
+        if not hasattr(dispositivo, comando):
+            raise ComandoInvalidoError(f"O dispositivo '{id_dispositivo}' não suporta o comando '{comando}'.")
+
+        metodo_verificacao = f"may_{comando}"
+        if hasattr(dispositivo, metodo_verificacao) and not getattr(dispositivo, metodo_verificacao)():
+            if self._metricas is not None:
+                self._metricas.registrar_comando(comando, dispositivo.tipo.name, time.perf_counter() - inicio)
+            return None
+
+        estado_antes, estado_depois, duracao_transicao, evento = self._transicionar(
+            dispositivo, comando, getattr(type(dispositivo), comando), args)
+        if evento is not None:
+            self._notificar(evento)
+        if self._metricas is not None:
+            self._metricas.registrar_comando(comando, dispositivo.tipo.name, time.perf_counter() - inicio,
+                                             self._chave_transicao(dispositivo, comando), duracao_transicao)
+        return estado_antes, estado_depois
+
+    def _transicionar(self, dispositivo: Dispositivo, comando: str, metodo: Callable,
+                      args: dict = None, registrar: bool = True) -> Tuple[str, str, float, Optional[Evento]]:
+        """
+        Chama `metodo(dispositivo, **args)` e grava a alteração no journal (com `registrar=False`
+        quem chama grava depois, ex.: o lote inteiro). Retorna (estado_antes, estado_depois, duração
+        da transição em segundos, evento a notificar ou None); sem instrumentação a duração é 0.0.
+        """
+        estado_antes = str(dispositivo.state)
+        if self._metricas is None:
+            metodo(dispositivo, **(args or {}))
+            duracao = 0.0
+        else:
+            inicio = time.perf_counter()
+            metodo(dispositivo, **(args or {}))
+            duracao = time.perf_counter() - inicio
+        estado_depois = str(dispositivo.state)
+
+        if registrar and (estado_antes != estado_depois or comando.startswith("definir")):
+            # O executor de rotinas chama este método de várias threads; o journal precisa de exclusão mútua.
+            # Os observers também podem ser chamados em paralelo (CSVLogger e RelatoriosObserver já usam lock).
+            with self._lock_registro:
+                self.registrar_alteracao(dispositivo)
+
+        if estado_antes == estado_depois:
+            return estado_antes, estado_depois, duracao, None
+        evento = Evento(
+            TipoEvento.COMANDO_EXECUTADO, id_dispositivo=dispositivo.id,
+            detalhes={"comando": comando, "args": args, "estado_antes": estado_antes, "estado_depois": estado_depois}
+        )
+        return estado_antes, estado_depois, duracao, evento
+
+    @staticmethod
+    def _chave_transicao(dispositivo: Dispositivo, comando: str) -> Optional[str]:
+        # Só triggers da tabela da FSM contam como transição (inclusive definir_brilho/definir_cor da Luz,
+        # que são transições on -> on); um comando que seja método comum fica só em "comando" e "tipo"
+        return f"{dispositivo.tipo.name}.{comando}" if comando in dispositivo.maquina.tabela else None
+
+    def executar_comando(self, id_dispositivo: str, comando: str, args: dict = None) -> Optional[Tuple[str, str]]:
+        resultado = self._aplicar_comando(id_dispositivo, comando, args)
+        if resultado is None:
+            estado = self.get_dispositivo(id_dispositivo).state
+            print(f"INFO: Comando '{comando}' não é uma transição válida do estado '{estado}'. Comando ignorado.")
+            return None
+
+        estado_antes, estado_depois = resultado
+        if estado_antes != estado_depois:
+            print(f"Comando '{comando}' executado em '{id_dispositivo}'. Estado: {estado_antes} -> {estado_depois}")
+        elif comando.startswith("definir"):
+            print(f"Comando '{comando}' executado em '{id_dispositivo}'. Atributo alterado.")
+        return resultado
+
+    def executar_rotina(self, nome_rotina: str, timeout: Optional[float] = None) -> ResultadoRotina:
+        """
+        Executa e imprime a rotina; nos dois modos devolve o ResultadoRotina com o status de cada passo.
+        Com `timeout` (segundos), os passos que ainda não começaram quando ele estoura ficam como "cancelado".
+        """
+        comandos = self._rotinas[nome_rotina]
+        if usa_dependencias(comandos):
+            # Rotinas com `depende_de`/`grupo` rodam em paralelo (ver core/rotinas.py)
+            resultado = self.executar_rotina_concorrente(nome_rotina, timeout=timeout)
+            print(resultado)
+            return resultado
+
+        resultado = ResultadoRotina(nome_rotina, [ResultadoPasso(i, acao) for i, acao in enumerate(comandos)])
+        cronometrar = self._metricas is not None or timeout is not None
+        inicio = time.perf_counter() if cronometrar else 0.0
+        print(f"--- Executando rotina: {nome_rotina} ---")
+        for passo, acao in zip(resultado.passos, comandos):
+            if timeout is not None and time.perf_counter() - inicio >= timeout:
+                resultado.expirou = True
+                passo.status = "cancelado"
+                continue
+            try:
+                estados = self.executar_comando(
+                    id_dispositivo=acao["id"],
+                    comando=acao["comando"],
+                    args=acao.get("argumentos")
+                )
+            except (DispositivoNaoEncontradoError, ComandoInvalidoError) as e:
+                passo.status, passo.erro = "erro", f"{e.__class__.__name__}: {e}"
+                print(f"Erro ao executar ação da rotina: {e}")
+                continue
+            passo.status = "ignorado" if estados is None else "ok"
+            if estados is not None:
+                passo.estado_antes, passo.estado_depois = estados
+        if resultado.expirou:
+            print(f"Tempo limite de {timeout} s atingido; os passos restantes não foram executados.")
+        print(f"--- Fim da rotina: {nome_rotina} ---")
+        if cronometrar:
+            # Sem instrumentação nem timeout a rotina sequencial não é cronometrada (duracao_s fica None)
+            resultado.duracao_s = time.perf_counter() - inicio
+        if self._metricas is not None:
+            self._metricas.registrar("rotina", nome_rotina, resultado.duracao_s)
+        return resultado
+
+    def executar_rotina_concorrente(self, nome_rotina: str, max_paralelo: int = 8,
+                                    timeout: Optional[float] = None) -> ResultadoRotina:
+        """
+        Executa a rotina respeitando as dependências entre os passos, com passos independentes em
+        paralelo e passos do mesmo dispositivo serializados. Não imprime; devolve um ResultadoRotina.
+        """
+        resultado = self._executor_rotinas.executar(nome_rotina, self._rotinas[nome_rotina], max_paralelo, timeout)
+        if self._metricas is not None:
+            self._metricas.registrar("rotina", nome_rotina, resultado.duracao_s)
+        return resultado
+
+    def _criar_dispositivo(self, dev_data: dict) -> Dispositivo:
+        try:
+            tipo_enum = TipoDispositivo[dev_data["tipo"]]
+            classe_dispositivo = TIPO_CLASSE_MAP[tipo_enum]
+            
+            args = {"id": dev_data["id"], "nome": dev_data["nome"]}
+            if tipo_enum == TipoDispositivo.LIGHT:
+                cor_str = dev_data["atributos"].get("cor", "NEUTRA")
+                args["cor"] = Cor[cor_str]
+                args["brilho"] = dev_data["atributos"].get("brilho", 50)
+            elif tipo_enum in (TipoDispositivo.OUTLET, TipoDispositivo.TV, TipoDispositivo.MICROWAVE):
+                args["potencia_w"] = dev_data["atributos"].get("potencia_w", 100)
+
+            dispositivo = classe_dispositivo(**args)
+            dispositivo.state = dev_data["estado"]
+            return dispositivo
+        except (KeyError, TypeError, ValueError) as e:
+            raise ConfiguracaoInvalidaError(f"Erro ao carregar dispositivo do JSON: {dev_data}. Erro: {e}")
+
+    @staticmethod
+    def _criar_stub(dev_data: dict) -> DispositivoStub:
+        try:
+            return DispositivoStub(dev_data)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ConfiguracaoInvalidaError(f"Erro ao carregar dispositivo do JSON: {dev_data}. Erro: {e}")
+
+    @staticmethod
+    def _registro_dispositivo(dispositivo: Dispositivo) -> dict:
+        if isinstance(dispositivo, DispositivoStub):
+            return dispositivo.dados  # ainda não foi usado: salva o registro como foi carregado
+        return {"id": dispositivo.id, "tipo": dispositivo.tipo.name, "nome": dispositivo.nome, **dispositivo.get_estado_dict()}
+
+    def _montar_configuracao(self) -> dict:
+        return {
+            "hub": {"nome": "Casa Exemplo", "versao": "1.0"},
+            "dispositivos": [self._registro_dispositivo(d) for d in self._dispositivos.values()],
+            "rotinas": self._rotinas
+        }
+
+    def carregar_configuracao(self):
+        if self._journal is not None and self._journal.existe():
+            config, origem = self._journal.carregar(), self._journal.caminho_snapshot
+        else:
+            try:
+                config, origem = carregar_de_json(self._config_path), self._config_path
+            except FileNotFoundError:
+                print(f"Arquivo de configuração '{self._config_path}' não encontrado. Iniciando Hub vazio.")
+                return
+
+        for dev_data in config.get("dispositivos", []):
+            dispositivo = self._criar_stub(dev_data) if self._carregamento_preguicoso else self._criar_dispositivo(dev_data)
+            self._dispositivos[dispositivo.id] = dispositivo
+            self._indice.adicionar(dispositivo)
+
+        self._rotinas = config.get("rotinas", {})
+        for nome, passos in self._rotinas.items():
+            if usa_dependencias(passos):
+                # Dependências inexistentes, ciclos e grupos inválidos aparecem ao carregar, não no meio da rotina
+                try:
+                    ExecutorRotinas.dependencias(passos)
+                except ConfiguracaoInvalidaError as e:
+                    raise ConfiguracaoInvalidaError(f"Rotina '{nome}' inválida: {e}")
+        if self._journal is not None and not self._journal.existe():
+            # Primeira execução com journal: o JSON importado vira o snapshot inicial
+            self._journal.compactar(self._montar_configuracao())
+        print(f"Configuração carregada de '{origem}'. {len(self._dispositivos)} dispositivos e {len(self._rotinas)} rotinas.")
+
+    def registrar_alteracao(self, dispositivo: Dispositivo):
+        """Grava no journal o estado atual do dispositivo (ex.: depois de alterar um atributo)."""
+        if self._journal is None:
+            return
+        self._journal.registrar_dispositivo(self._registro_dispositivo(dispositivo))
+        self._compactar_se_necessario()
+
+    def registrar_alteracoes(self, dispositivos: List[Dispositivo]):
+        """Como registrar_alteracao, para vários dispositivos em uma única gravação do journal."""
+        if self._journal is None or not dispositivos:
+            return
+        self._journal.registrar_dispositivos([self._registro_dispositivo(d) for d in dispositivos])
+        self._compactar_se_necessario()
+
+    def _compactar_se_necessario(self):
+        if self._journal.precisa_compactar():
+            self._journal.compactar(self._montar_configuracao())
+
+    def salvar_configuracao(self):
+        with self._lock_registro:
+            if self._journal is not None:
+                # As alterações já estão no journal; salvar gera um snapshot compactado
+                self._journal.compactar(self._montar_configuracao())
+            else:
+                salvar_em_json(self._config_path, self._montar_configuracao())
+        print("configuracao salva.")
+
+    def exportar_configuracao(self, caminho: str = None):
+        """Exporta a configuração completa no formato do configuracao.json."""
+        with self._lock_registro:
+            config = self._montar_configuracao()
+        salvar_em_json(caminho or self._config_path, config)
+        print(f"configuracao exportada para '{caminho or self._config_path}'.")
@@ -0,0 +1,50 @@
+# smart_home/core/indices.py
+"""
+Índices secundários do hub: dispositivos por tipo e por (tipo, estado).
+Os dispositivos avisam o índice em `Dispositivo._definir_estado`, então ele se mantém
+atualizado a cada transição da FSM sem varrer a lista de dispositivos.
+"""
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .dispositivos import Dispositivo, TipoDispositivo
+
+
+class IndiceDispositivos:
+    def __init__(self):
+        self._por_tipo: Dict[TipoDispositivo, Dict[str, Dispositivo]] = defaultdict(dict)
+        self._por_tipo_estado: Dict[Tuple[TipoDispositivo, str], Dict[str, Dispositivo]] = defaultdict(dict)
+        self._lock = Lock()  # transições de dispositivos diferentes podem ocorrer em threads diferentes
+
+    def adicionar(self, dispositivo: Dispositivo):
+        with self._lock:
+            self._por_tipo[dispositivo.tipo][dispositivo.id] = dispositivo
+            self._por_tipo_estado[(dispositivo.tipo, dispositivo.state)][dispositivo.id] = dispositivo
+        dispositivo._indice = self
+
+    def remover(self, dispositivo: Dispositivo):
+        with self._lock:
+            self._por_tipo[dispositivo.tipo].pop(dispositivo.id, None)
+            self._por_tipo_estado[(dispositivo.tipo, dispositivo.state)].pop(dispositivo.id, None)
+        dispositivo._indice = None
+
+    def mudou_estado(self, dispositivo: Dispositivo, antes: Optional[int], depois: int):
+        estados = dispositivo.maquina.estados
+        with self._lock:
+            if antes is not None:
+                self._por_tipo_estado[(dispositivo.tipo, estados[antes])].pop(dispositivo.id, None)
+            self._por_tipo_estado[(dispositivo.tipo, estados[depois])][dispositivo.id] = dispositivo
+
+    def buscar(self, tipo: Optional[TipoDispositivo] = None, estado: Optional[str] = None) -> Optional[List[Dispositivo]]:
+        """
+        Dispositivos do tipo e/ou estado informados.
+        Retorna None quando nenhum critério é dado (quem chama usa a lista completa).
+        """
+        if tipo is not None and estado is not None:
+            return list(self._por_tipo_estado.get((tipo, estado), {}).values())
+        if tipo is not None:
+            return list(self._por_tipo.get(tipo, {}).values())
+        if estado is not None:
+            return [d for (_, e), grupo in self._por_tipo_estado.items() if e == estado for d in grupo.values()]
+        return None
@@ -0,0 +1,199 @@
+# smart_home/core/logger.py
+import atexit
+import csv
+import os
+import time
+from threading import Condition, Lock, Thread
+from typing import List
+from .observers import Observer
+from .eventos import Evento, TipoEvento
+
+CABECALHO = ['timestamp', 'id_dispositivo', 'evento', 'estado_origem', 'estado_destino']
+
+class CSVLogger(Observer):
+    _instance = None #XXX
+    _lock = Lock() #para assegurar consistência no uso do logger quando usar threads
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, filepath='smart_home/data/eventos.csv', bufferizado=False,
+                 tamanho_lote=500, intervalo_flush=1.0, fsync=False):
+        """
+        Modo direto (padrão): cada evento abre, escreve e fecha o arquivo.
+        Modo bufferizado: o arquivo fica aberto, as linhas vão para uma fila em memória e uma
+        thread em segundo plano grava em lote quando a fila chega a `tamanho_lote` linhas ou
+        quando a linha mais antiga tem `intervalo_flush` segundos. Com `fsync=True`, cada flush
+        só retorna depois de o sistema operacional confirmar a gravação em disco.
+        """
+        if not hasattr(self, 'initialized'):
+            self.filepath = filepath
+            self.bufferizado = bufferizado
+            self.tamanho_lote = tamanho_lote
+            self.intervalo_flush = intervalo_flush
+            self.fsync = fsync
+            self._fila = []
+            self._inicio_fila = None  # momento em que a linha mais antiga da fila foi enfileirada
+            self._condicao = Condition()
+            self._lock_arquivo = Lock()
+            self._arquivo = None
+            self._writer = None
+            self._thread = None
+            self._encerrando = False
+            if bufferizado:
+                atexit.register(self.close)
+            self.initialized = True
+
+    @staticmethod
+    def _deve_registrar(evento: Evento) -> bool:
+        return evento.tipo == TipoEvento.COMANDO_EXECUTADO and evento.dados.get('estado_antes') != evento.dados.get('estado_depois')
+
+    def update(self, evento: Evento):
+        if self._deve_registrar(evento):
+            self.log_event(evento)
+
+    def update_lote(self, eventos: List[Evento]):
+        linhas = [self._linha(evento) for evento in eventos if self._deve_registrar(evento)]
+        if not linhas:
+            return
+        if self.bufferizado:
+            for linha in linhas:
+                self._enfileirar(linha)
+            return
+        self._escrever_direto(linhas)  # um único open/write para o lote inteiro
+
+    @staticmethod
+    def _linha(evento: Evento) -> list:
+        return [
+            evento.timestamp,
+            evento.id_dispositivo,
+            evento.dados.get('comando', 'N/A'),
+            evento.dados.get('estado_antes', 'N/A'),
+            evento.dados.get('estado_depois', 'N/A'),
+        ]
+
+    def log_event(self, evento: Evento):
+        if self.bufferizado:
+            self._enfileirar(self._linha(evento))
+            return
+        self._escrever_direto([self._linha(evento)])
+
+    def _escrever_direto(self, linhas: List[list]):
+        """Modo direto: abre o arquivo, grava as linhas (e o cabeçalho, se o arquivo estiver vazio) e fecha."""
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+                escrever_cabecalho = not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0
+                with open(self.filepath, 'a', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    if escrever_cabecalho:
+                        writer.writerow(CABECALHO)
+                    writer.writerows(linhas)
+            except Exception as e:
+                print(f"[ERRO NO LOGGER]: Não foi possível escrever no arquivo de log: {e}")
+
+    # --- MODO BUFFERIZADO ---
+
+    def _enfileirar(self, linha: list):
+        with self._condicao:
+            if self._thread is None or not self._thread.is_alive():
+                self._encerrando = False
+                self._thread = Thread(target=self._loop_flush, name="CSVLogger-flush", daemon=True)
+                self._thread.start()
+            if not self._fila:
+                self._inicio_fila = time.monotonic()
+            self._fila.append(linha)
+            if len(self._fila) >= self.tamanho_lote:
+                self._condicao.notify()
+
+    def _loop_flush(self):
+        while True:
+            with self._condicao:
+                while not self._encerrando:
+                    if len(self._fila) >= self.tamanho_lote:
+                        break
+                    if self._fila:
+                        restante = self._inicio_fila + self.intervalo_flush - time.monotonic()
+                        if restante <= 0:
+                            break
+                        self._condicao.wait(restante)
+                    else:
+                        self._condicao.wait()
+                if self._encerrando and not self._fila:
+                    return
+            if not self.flush():
+                if self._encerrando:
+                    return  # close() faz a última tentativa e avisa o que sobrou
+                # Falha de gravação: as linhas voltaram para a fila; espera antes de tentar de novo
+                with self._condicao:
+                    self._condicao.wait(self.intervalo_flush)
+
+    def _abrir_arquivo(self):
+        diretorio = os.path.dirname(self.filepath)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        escrever_cabecalho = not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0
+        self._arquivo = open(self.filepath, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._arquivo)
+        if escrever_cabecalho:
+            self._writer.writerow(CABECALHO)
+
+    def flush(self) -> bool:
+        """
+        Grava imediatamente todas as linhas enfileiradas (e faz fsync se configurado).
+        Se a gravação falhar, as linhas voltam para o início da fila e são regravadas no próximo
+        flush (uma falha no meio da gravação pode repetir linhas, mas não perde nenhuma).
+        Retorna False quando a gravação falhou.
+        """
+        with self._lock_arquivo:
+            with self._condicao:
+                lote, self._fila = self._fila, []
+                self._inicio_fila = None
+            if not lote and self._arquivo is None:
+                return True
+            try:
+                if self._arquivo is None:
+                    self._abrir_arquivo()
+                self._writer.writerows(lote)
+                self._arquivo.flush()
+                if self.fsync:
+                    os.fsync(self._arquivo.fileno())
+                return True
+            except Exception as e:
+                print(f"[ERRO NO LOGGER]: Não foi possível escrever no arquivo de log ({len(lote)} eventos mantidos na fila): {e}")
+                self._descartar_arquivo()
+                with self._condicao:
+                    self._fila = lote + self._fila
+                    self._inicio_fila = time.monotonic()
+                return False
+
+    def _descartar_arquivo(self):
+        # Depois de um erro o arquivo é reaberto no próximo flush
+        try:
+            if self._arquivo is not None:
+                self._arquivo.close()
+        except Exception:
+            pass
+        self._arquivo = None
+        self._writer = None
+
+    def close(self):
+        """Encerra a thread de flush, grava o que ainda está na fila e fecha o arquivo."""
+        with self._condicao:
+            self._encerrando = True
+            self._condicao.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+            self._thread = None
+        if not self.flush():
+            print(f"[ERRO NO LOGGER]: {len(self._fila)} eventos não puderam ser gravados em '{self.filepath}'.")
+        with self._lock_arquivo:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+                self._writer = None
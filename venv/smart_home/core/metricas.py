@@ -0,0 +1,153 @@
+# smart_home/core/metricas.py
+"""
+Instrumentação opcional do hub: histogramas de latência por comando, por tipo de dispositivo,
+por observer e das transições da FSM. Só é usada quando o HubAutomacao é criado com
+`instrumentacao=True`; desligada, o hub não mede nada.
+
+Cada amostra custa duas leituras de `time.perf_counter()`, uma busca binária nos limites
+dos baldes e um lock curto (comandos de rotinas chegam de várias threads).
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from .eventos import Evento
+from .observers import Observer
+
+# Limites superiores dos baldes, em segundos: 1 µs, 2 µs, 4 µs, ... até ~16 s (o último balde é aberto)
+LIMITES_BALDES = [1e-6 * 2 ** k for k in range(25)]
+
+
+class Histograma:
+    """Histograma de latências com baldes em escala logarítmica (base 2)."""
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_BALDES) + 1)
+        self.contagem = 0
+        self.total_s = 0.0
+        self.minimo_s = float("inf")
+        self.maximo_s = 0.0
+
+    def registrar(self, segundos: float):
+        self.baldes[bisect_left(LIMITES_BALDES, segundos)] += 1
+        self.contagem += 1
+        self.total_s += segundos
+        if segundos < self.minimo_s:
+            self.minimo_s = segundos
+        if segundos > self.maximo_s:
+            self.maximo_s = segundos
+
+    def percentil(self, p: float) -> float:
+        """Estimativa pelo limite superior do balde (nunca acima do máximo observado)."""
+        if not self.contagem:
+            return 0.0
+        alvo = p / 100 * self.contagem
+        acumulado = 0
+        for i, quantidade in enumerate(self.baldes):
+            acumulado += quantidade
+            if quantidade and acumulado >= alvo:
+                return min(LIMITES_BALDES[i], self.maximo_s) if i < len(LIMITES_BALDES) else self.maximo_s
+        return self.maximo_s
+
+    def resumo(self) -> Dict[str, Any]:
+        if not self.contagem:
+            return {"contagem": 0}
+        return {
+            "contagem": self.contagem,
+            "total_ms": round(self.total_s * 1000, 3),
+            "media_ms": round(self.total_s / self.contagem * 1000, 4),
+            "min_ms": round(self.minimo_s * 1000, 4),
+            "p50_ms": round(self.percentil(50) * 1000, 4),
+            "p95_ms": round(self.percentil(95) * 1000, 4),
+            "p99_ms": round(self.percentil(99) * 1000, 4),
+            "max_ms": round(self.maximo_s * 1000, 4),
+        }
+
+
+class MetricasHub:
+    """Agrupa os histogramas do hub por categoria ('comando', 'tipo', 'observer', 'transicao', 'rotina')."""
+
+    CATEGORIAS = ("comando", "tipo", "transicao", "observer", "rotina")
+
+    def __init__(self):
+        self._lock = Lock()
+        self._inicio = time.time()
+        self._histogramas: Dict[str, Dict[str, Histograma]] = {c: defaultdict(Histograma) for c in self.CATEGORIAS}
+
+    def registrar(self, categoria: str, chave: str, segundos: float):
+        with self._lock:
+            self._histogramas[categoria][chave].registrar(segundos)
+
+    def registrar_comando(self, comando: str, tipo: str, segundos: float,
+                          transicao: Optional[str] = None, segundos_transicao: float = 0.0):
+        """Latência total do comando (por comando e por tipo) e, se houve, da transição da FSM, com um só lock."""
+        with self._lock:
+            self._histogramas["comando"][comando].registrar(segundos)
+            self._histogramas["tipo"][tipo].registrar(segundos)
+            if transicao is not None:
+                self._histogramas["transicao"][transicao].registrar(segundos_transicao)
+
+    def zerar(self):
+        with self._lock:
+            self._inicio = time.time()
+            for histogramas in self._histogramas.values():
+                histogramas.clear()
+
+    def resumo(self) -> Dict[str, Any]:
+        with self._lock:
+            resultado: Dict[str, Any] = {"coletando_ha_s": round(time.time() - self._inicio, 3)}
+            for categoria, histogramas in self._histogramas.items():
+                resultado[categoria] = {chave: h.resumo() for chave, h in sorted(histogramas.items())}
+            return resultado
+
+
+class ObserverMedido(Observer):
+    """
+    Envolve um observer e registra o tempo de cada entrega. No despacho assíncrono fica dentro
+    da FilaObserver, então mede o processamento na thread do observer, não o enfileiramento.
+    """
+
+    def __init__(self, observer: Observer, metricas: MetricasHub):
+        self.observer = observer
+        self.metricas = metricas
+        self.nome = type(observer).__name__
+
+    def update(self, evento: Evento):
+        inicio = time.perf_counter()
+        try:
+            self.observer.update(evento)
+        finally:
+            self.metricas.registrar("observer", self.nome, time.perf_counter() - inicio)
+
+    def update_lote(self, eventos: List[Evento]):
+        inicio = time.perf_counter()
+        try:
+            self.observer.update_lote(eventos)
+        finally:
+            self.metricas.registrar("observer", self.nome, time.perf_counter() - inicio)
+
+
+def formatar_metricas(metricas: Optional[Dict[str, Any]]) -> str:
+    """Texto tabulado usado pela CLI."""
+    if metricas is None:
+        return "Instrumentação desativada (inicie o hub com --metricas)."
+    titulos = {
+        "comando": "Latência por comando",
+        "tipo": "Latência por tipo de dispositivo",
+        "transicao": "Tempo nas transições da FSM",
+        "observer": "Tempo por observer",
+        "rotina": "Duração das rotinas",
+    }
+    linhas = [f"Coletando há {metricas['coletando_ha_s']:.1f} s"]
+    for categoria, titulo in titulos.items():
+        linhas.append(f"\n--- {titulo} ---")
+        if not metricas[categoria]:
+            linhas.append("  (sem amostras)")
+            continue
+        linhas.append(f"  {'':<24} {'n':>7} {'média':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'máx':>9}  (ms)")
+        for chave, r in metricas[categoria].items():
+            linhas.append(f"  {chave:<24} {r['contagem']:>7} {r['media_ms']:>9.3f} {r['p50_ms']:>9.3f} "
+                          f"{r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['max_ms']:>9.3f}")
+    return "\n".join(linhas)
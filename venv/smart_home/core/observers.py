@@ -0,0 +1,19 @@
+# smart_home/core/observers.py
+from abc import ABC, abstractmethod
+from typing import List
+from .eventos import Evento
+
+class Observer(ABC):
+    @abstractmethod
+    def update(self, evento: Evento):
+        pass
+
+    def update_lote(self, eventos: List[Evento]):
+        """Recebe vários eventos de uma vez (ex.: comando em massa). Sobrescreva para processar em lote."""
+        for evento in eventos:
+            self.update(evento)
+
+class ConsoleObserver(Observer):
+    def update(self, evento: Evento):
+        print(f"[EVENTO CONSOLE] {evento}")
+
@@ -0,0 +1,171 @@
+# smart_home/core/persistencia.py
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+from .erros import ConfiguracaoInvalidaError
+
+def carregar_de_json(caminho_arquivo: str) -> dict:
+    """Carrega dados de um arquivo JSON."""
+    try:
+        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # Se o arquivo não existe, é um estado válido (primeira execução).
+        # Retorna um dicionário vazio para o Hub lidar com isso.
+        return {}
+    except json.JSONDecodeError as e:
+        # Se o arquivo existe mas é inválido, lança uma exceção personalizada.
+        raise ConfiguracaoInvalidaError(f"Erro ao decodificar o JSON em '{caminho_arquivo}': {e}")
+
+
+def escrever_atomico(caminho_arquivo: str, conteudo: str):
+    """
+    Grava em um arquivo temporário no mesmo diretório, faz fsync e renomeia por cima do destino.
+    Uma queda no meio da gravação deixa o arquivo anterior intacto.
+    """
+    temporario = f"{caminho_arquivo}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho_arquivo)
+
+
+def salvar_em_json(caminho_arquivo: str, dados: dict):
+    """Salva dados em um arquivo JSON de forma segura."""
+    try:
+        escrever_atomico(caminho_arquivo, json.dumps(dados, indent=2, ensure_ascii=False))
+    except IOError as e:
+        print(f"ERRO: Não foi possível salvar o arquivo de configuração em '{caminho_arquivo}': {e}")
+
+
+class JournalEstado:
+    """
+    Persistência incremental: um journal só de acréscimo (uma linha JSON por alteração) mais
+    snapshots compactados. Ao iniciar, carrega o snapshot mais recente e reaplica o final do journal.
+
+    Arquivos (a partir de `caminho_base`, ex.: 'data/configuracao'):
+      - <base>.snapshot.json : configuração completa, no mesmo formato do configuracao.json, mais o campo "seq"
+      - <base>.journal.jsonl : registros {"seq": n, "op": "set", "dispositivo": {...}} ou {"seq": n, "op": "del", "id": ...}
+    """
+
+    def __init__(self, caminho_base: str, compactar_a_cada: int = 10000, fsync: bool = False):
+        self.caminho_snapshot = f"{caminho_base}.snapshot.json"
+        self.caminho_journal = f"{caminho_base}.journal.jsonl"
+        self.compactar_a_cada = compactar_a_cada
+        self.fsync = fsync
+        self._seq = 0
+        self._registros_desde_snapshot = 0
+        self._arquivo = None
+
+    def existe(self) -> bool:
+        return os.path.exists(self.caminho_snapshot)
+
+    def carregar(self) -> dict:
+        """
+        Retorna a configuração do snapshot com as alterações do journal já aplicadas.
+        Uma última linha danificada (queda durante a gravação) é descartada e cortada do arquivo;
+        qualquer outro registro inválido é ignorado com um aviso, e os registros seguintes são aplicados.
+        """
+        config = carregar_de_json(self.caminho_snapshot)
+        self._seq = config.pop("seq", 0)
+        dispositivos = {d["id"]: d for d in config.get("dispositivos", [])}
+        self._registros_desde_snapshot = 0
+        try:
+            with open(self.caminho_journal, 'rb') as f:
+                posicao = 0
+                valido_ate = 0  # posição logo após o último registro válido
+                invalido = None  # número da última linha inválida ainda não avisada
+                for numero, linha in enumerate(f, start=1):
+                    posicao += len(linha)
+                    registro = self._ler_registro(linha)
+                    if invalido is not None:
+                        # A linha inválida anterior não era a última: corrupção no meio do journal
+                        print(f"AVISO: Registro inválido na linha {invalido} de '{self.caminho_journal}' ignorado.")
+                        invalido = None
+                    if registro is None:
+                        invalido = numero
+                        continue
+                    valido_ate = posicao
+                    if registro["seq"] <= self._seq:
+                        continue  # já incluído no snapshot
+                    self._aplicar(dispositivos, registro)
+                    self._seq = registro["seq"]
+                    self._registros_desde_snapshot += 1
+            if invalido is not None:
+                print(f"AVISO: Registro incompleto na linha {invalido} (última) de '{self.caminho_journal}' descartado.")
+                os.truncate(self.caminho_journal, valido_ate)
+        except FileNotFoundError:
+            pass
+        config["dispositivos"] = list(dispositivos.values())
+        return config
+
+    @staticmethod
+    def _ler_registro(linha: bytes) -> Optional[Dict[str, Any]]:
+        """Registro da linha, ou None se ela estiver incompleta ou não tiver o formato esperado."""
+        if not linha.endswith(b"\n"):
+            return None
+        try:
+            registro = json.loads(linha)
+        except ValueError:
+            return None
+        if not isinstance(registro, dict) or not isinstance(registro.get("seq"), int):
+            return None
+        if registro.get("op") == "set" and isinstance(registro.get("dispositivo"), dict) and "id" in registro["dispositivo"]:
+            return registro
+        if registro.get("op") == "del" and "id" in registro:
+            return registro
+        return None
+
+    @staticmethod
+    def _aplicar(dispositivos: Dict[str, Any], registro: Dict[str, Any]):
+        if registro["op"] == "set":
+            dispositivos[registro["dispositivo"]["id"]] = registro["dispositivo"]
+        else:
+            dispositivos.pop(registro["id"], None)
+
+    def _escrever(self, registros: List[Dict[str, Any]]):
+        """Grava os registros com um único write, flush e (se configurado) fsync."""
+        if not registros:
+            return
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho_journal, 'a', encoding='utf-8')
+        linhas = []
+        for registro in registros:
+            self._seq += 1
+            registro["seq"] = self._seq
+            linhas.append(json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._arquivo.write("".join(linhas))
+        self._arquivo.flush()
+        if self.fsync:
+            os.fsync(self._arquivo.fileno())
+        self._registros_desde_snapshot += len(registros)
+
+    def registrar_dispositivo(self, registro_dispositivo: Dict[str, Any]):
+        """Registra o estado atual (id, tipo, nome, estado, atributos) de um dispositivo."""
+        self._escrever([{"op": "set", "dispositivo": registro_dispositivo}])
+
+    def registrar_dispositivos(self, registros_dispositivos: List[Dict[str, Any]]):
+        """Como registrar_dispositivo, para vários dispositivos de uma vez (ex.: comando em massa)."""
+        self._escrever([{"op": "set", "dispositivo": r} for r in registros_dispositivos])
+
+    def registrar_remocao(self, id_dispositivo: str):
+        self._escrever([{"op": "del", "id": id_dispositivo}])
+
+    def precisa_compactar(self) -> bool:
+        return self._registros_desde_snapshot >= self.compactar_a_cada
+
+    def compactar(self, config: dict):
+        """Grava um snapshot atômico com `config` e descarta o journal já incorporado a ele."""
+        escrever_atomico(self.caminho_snapshot, json.dumps({**config, "seq": self._seq}, ensure_ascii=False))
+        # Se houver uma queda antes do truncamento, os registros com seq <= snapshot são ignorados ao carregar
+        self.fechar()
+        with open(self.caminho_journal, 'w', encoding='utf-8'):
+            pass
+        self._registros_desde_snapshot = 0
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
@@ -0,0 +1,325 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from collections import Counter, defaultdict
+from itertools import pairwise
+from threading import Lock
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
+
+from .eventos import Evento, TipoEvento
+from .observers import Observer
+from .persistencia import escrever_atomico
+
+# O tipo é conferido por `dispositivo.tipo`, o que também vale para os DispositivoStub do carregamento preguiçoso
+from .dispositivos import TipoDispositivo
+
+Timestamp = Union[str, datetime]
+
+# --- FUNÇÕES AUXILIARES PARA CARREGAR DADOS ---
+
+def carregar_eventos(filepath='smart_home/data/eventos.csv') -> List[Dict[str, Any]]:
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            eventos = list(reader)
+            for evento in eventos:
+                evento['timestamp'] = datetime.fromisoformat(evento['timestamp'])
+            return eventos
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        print(f"ERRO: Falha ao carregar ou processar eventos de '{filepath}': {e}")
+        return []
+
+def iterar_eventos(filepath='smart_home/data/eventos.csv', a_partir_do_byte: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Lê o CSV linha a linha, sem carregar o arquivo inteiro na memória.
+    O timestamp continua como string; o motor só converte para datetime quando precisa.
+    `a_partir_do_byte` pula as linhas anteriores a essa posição (usado para continuar de um checkpoint).
+    """
+    try:
+        with open(filepath, 'rb') as bruto:
+            cabecalho = next(csv.reader([bruto.readline().decode('utf-8')]), None)
+            if cabecalho is None:
+                return
+            if bruto.tell() < a_partir_do_byte <= os.fstat(bruto.fileno()).st_size:
+                # Alinha no início de uma linha caso a posição caia no meio de uma
+                bruto.seek(a_partir_do_byte - 1)
+                if bruto.read(1) != b'\n':
+                    bruto.readline()
+            yield from csv.DictReader(io.TextIOWrapper(bruto, encoding='utf-8', newline=''), fieldnames=cabecalho)
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        print(f"ERRO: Falha ao carregar ou processar eventos de '{filepath}': {e}")
+
+# --- MOTOR DE RELATÓRIOS (PASSADA ÚNICA) ---
+
+class MotorRelatorios:
+    """
+    Calcula todos os relatórios em uma única passada sobre os eventos.
+
+    O estado é agrupado por `id_dispositivo` em dicionários, então a memória depende do número
+    de dispositivos e não do tamanho do log. Os eventos de cada dispositivo devem chegar em ordem
+    cronológica (como no eventos.csv, que só recebe linhas no final).
+    `desde`/`ate` limitam o relatório ao intervalo [desde, ate]: só os eventos do intervalo contam
+    como uso/comandos, mas ligar/desligar são pareados no log inteiro e cada período ligado é
+    recortado ao intervalo (um dispositivo que já estava ligado em `desde` conta desde `desde`, e
+    um que continua ligado no fim do log conta até `ate`, ou até agora se só `desde` foi dado).
+
+    Os agregados não dependem dos objetos de dispositivo: o tipo e a potência atuais de cada
+    dispositivo só são consultados quando um relatório é pedido.
+    """
+
+    def __init__(self, desde: Optional[datetime] = None, ate: Optional[datetime] = None):
+        self._desde, self._ate = desde, ate
+        # Timestamps gravados por datetime.isoformat() podem ser comparados como texto
+        self._desde_iso = desde.isoformat() if desde else None
+        self._ate_iso = ate.isoformat() if ate else None
+
+        self._uso = Counter()
+        self._comandos: Dict[str, Counter] = defaultdict(Counter)
+        self._ligado_desde: Dict[str, datetime] = {}  # intervalos ligados ainda abertos
+        self._segundos_ligado: Dict[str, float] = defaultdict(float)
+
+    def _no_periodo(self, timestamp: Timestamp) -> bool:
+        if isinstance(timestamp, str):
+            desde, ate = self._desde_iso, self._ate_iso
+        else:
+            desde, ate = self._desde, self._ate
+        return (desde is None or timestamp >= desde) and (ate is None or timestamp <= ate)
+
+    def processar(self, evento: Dict[str, Any]):
+        """Atualiza os agregados com um evento. O evento recebido não é modificado."""
+        timestamp = evento['timestamp']
+        id_dispositivo = evento['id_dispositivo']
+        comando = evento['evento']
+
+        if (self._desde is None and self._ate is None) or self._no_periodo(timestamp):
+            self._uso[id_dispositivo] += 1
+            self._comandos[id_dispositivo][comando] += 1
+
+        # O pareamento ligar/desligar considera todos os eventos; o recorte ao período é feito na soma
+        if comando == 'ligar' and id_dispositivo not in self._ligado_desde:
+            self._ligado_desde[id_dispositivo] = self._para_datetime(timestamp)
+        elif comando == 'desligar' and id_dispositivo in self._ligado_desde:
+            inicio = self._ligado_desde.pop(id_dispositivo)
+            segundos = self._segundos_no_periodo(inicio, self._para_datetime(timestamp))
+            if segundos:
+                self._segundos_ligado[id_dispositivo] += segundos
+
+    def _segundos_no_periodo(self, inicio: datetime, fim: datetime) -> float:
+        if self._desde is not None and inicio < self._desde:
+            inicio = self._desde
+        if self._ate is not None and fim > self._ate:
+            fim = self._ate
+        return max((fim - inicio).total_seconds(), 0.0)
+
+    def _segundos_ligado_total(self, id_dispositivo: str) -> float:
+        segundos = self._segundos_ligado.get(id_dispositivo, 0.0)
+        if (self._desde is not None or self._ate is not None) and id_dispositivo in self._ligado_desde:
+            # Ainda ligado no fim do log: conta até `ate`, sem passar do momento atual
+            # (sem período nenhum, o intervalo aberto não conta, como nas funções originais)
+            agora = datetime.now((self._ate or self._desde).tzinfo)
+            fim = min(self._ate, agora) if self._ate is not None else agora
+            segundos += self._segundos_no_periodo(self._ligado_desde[id_dispositivo], fim)
+        return segundos
+
+    def processar_todos(self, eventos: Iterable[Dict[str, Any]]) -> 'MotorRelatorios':
+        for evento in eventos:
+            self.processar(evento)
+        return self
+
+    @staticmethod
+    def _para_datetime(timestamp: Timestamp) -> datetime:
+        return datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+
+    # --- RESULTADOS ---
+
+    def tempo_luz_ligada(self, dispositivos: List[Any]) -> Dict[str, float]:
+        luzes = filter(lambda d: d.tipo == TipoDispositivo.LIGHT, dispositivos)
+        return {luz.id: round(self._segundos_ligado_total(luz.id), 2) for luz in luzes}
+
+    def consumo_tomada(self, dispositivos: List[Any]) -> Dict[str, float]:
+        # Consumo (Wh) = potência atual da tomada x horas ligada
+        tomadas = filter(lambda d: d.tipo == TipoDispositivo.OUTLET, dispositivos)
+        return {
+            tomada.id: round(tomada.potencia_w * (self._segundos_ligado_total(tomada.id) / 3600), 4)
+            for tomada in tomadas
+        }
+
+    def dispositivos_mais_usados(self) -> List[tuple[str, int]]:
+        # SORTED com lambda: do mais para o menos usado (empates mantêm a ordem de aparição)
+        return sorted(self._uso.items(), key=lambda item: item[1], reverse=True)
+
+    def distribuicao_comandos_por_tipo(self, dispositivos: List[Any]) -> Dict[str, Dict[str, int]]:
+        id_para_tipo = {d.id: d.tipo.value for d in dispositivos}
+        por_tipo: Dict[str, Counter] = defaultdict(Counter)
+        for id_dispositivo, comandos in self._comandos.items():
+            por_tipo[id_para_tipo.get(id_dispositivo, 'DESCONHECIDO')].update(comandos)
+        return {tipo: dict(por_tipo[tipo]) for tipo in sorted(por_tipo)}
+
+    @staticmethod
+    def tentativas_invalidas_porta(dispositivos: List[Any]) -> Dict[str, int]:
+        # Este dado vem diretamente do estado dos objetos, não dos logs
+        portas = filter(lambda d: d.tipo == TipoDispositivo.DOOR, dispositivos)
+        return {porta.id: porta.tentativas_invalidas for porta in portas if porta.tentativas_invalidas > 0}
+
+    def resultados(self, dispositivos: List[Any]) -> Dict[str, Any]:
+        return {
+            "tempo_luz_ligada": self.tempo_luz_ligada(dispositivos),
+            "consumo_tomada": self.consumo_tomada(dispositivos),
+            "dispositivos_mais_usados": self.dispositivos_mais_usados(),
+            "distribuicao_comandos_por_tipo": self.distribuicao_comandos_por_tipo(dispositivos),
+            "tentativas_invalidas_porta": self.tentativas_invalidas_porta(dispositivos),
+        }
+
+    # --- CHECKPOINT ---
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            "dispositivos": {
+                id_dispositivo: {
+                    "uso": self._uso.get(id_dispositivo, 0),
+                    "comandos": dict(self._comandos.get(id_dispositivo, {})),
+                    "segundos_ligado": self._segundos_ligado.get(id_dispositivo, 0.0),
+                    "ligado_desde": self._ligado_desde[id_dispositivo].isoformat()
+                                    if id_dispositivo in self._ligado_desde else None,
+                }
+                for id_dispositivo in {**self._uso, **self._ligado_desde}
+            },
+        }
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> 'MotorRelatorios':
+        motor = cls()
+        for id_dispositivo, agregados in dados.get("dispositivos", {}).items():
+            if agregados["uso"]:
+                motor._uso[id_dispositivo] = agregados["uso"]
+                motor._comandos[id_dispositivo].update(agregados["comandos"])
+            if agregados["segundos_ligado"]:
+                motor._segundos_ligado[id_dispositivo] = agregados["segundos_ligado"]
+            if agregados["ligado_desde"]:
+                motor._ligado_desde[id_dispositivo] = datetime.fromisoformat(agregados["ligado_desde"])
+        return motor
+
+def gerar_relatorios(dispositivos: List[Any], filepath='smart_home/data/eventos.csv',
+                     desde: Optional[datetime] = None, ate: Optional[datetime] = None) -> Dict[str, Any]:
+    """Lê o eventos.csv uma única vez e devolve os cinco relatórios."""
+    return MotorRelatorios(desde, ate).processar_todos(iterar_eventos(filepath)).resultados(dispositivos)
+
+# --- AGREGADOS MATERIALIZADOS (ALIMENTADOS PELOS EVENTOS DO HUB) ---
+
+class RelatoriosObserver(Observer):
+    """
+    Mantém os agregados dos relatórios atualizados em memória conforme os eventos COMANDO_EXECUTADO
+    passam pelo hub, de modo que gerar um relatório custa O(dispositivos) e não lê arquivo algum.
+    """
+    # Versão 2: a continuação usa só a posição (em bytes) do eventos.csv gravada no checkpoint.
+    # A versão 1 também filtrava por timestamp e é descartada (os agregados são reconstruídos do CSV).
+    VERSAO_CHECKPOINT = 2
+
+    def __init__(self, motor: Optional[MotorRelatorios] = None):
+        self._motor = motor or MotorRelatorios()
+        self._lock = Lock()  # update pode vir da thread de um FilaObserver
+
+    def update(self, evento: Evento):
+        self.update_lote([evento])
+
+    def update_lote(self, eventos: List[Evento]):
+        with self._lock:
+            for evento in eventos:
+                if evento.tipo == TipoEvento.COMANDO_EXECUTADO and evento.dados.get('estado_antes') != evento.dados.get('estado_depois'):
+                    self._motor.processar({
+                        'timestamp': evento.timestamp,
+                        'id_dispositivo': evento.id_dispositivo,
+                        'evento': evento.dados.get('comando', 'N/A'),
+                    })
+
+    def resultados(self, dispositivos: List[Any]) -> Dict[str, Any]:
+        with self._lock:
+            return self._motor.resultados(dispositivos)
+
+    def salvar_checkpoint(self, caminho: str, caminho_eventos: str):
+        """
+        Grava os agregados em JSON de forma atômica (ver persistencia.escrever_atomico), junto com o
+        tamanho atual do eventos.csv. Chame depois de esvaziar as filas do hub e do logger: os
+        agregados precisam corresponder exatamente às linhas gravadas até esse tamanho.
+        """
+        with self._lock:
+            dados = self._motor.para_dict()
+        dados["versao"] = self.VERSAO_CHECKPOINT
+        dados["tamanho_eventos"] = os.path.getsize(caminho_eventos) if os.path.exists(caminho_eventos) else 0
+        try:
+            escrever_atomico(caminho, json.dumps(dados, ensure_ascii=False))
+        except IOError as e:
+            print(f"ERRO: Não foi possível salvar o checkpoint dos relatórios em '{caminho}': {e}")
+
+    @classmethod
+    def carregar(cls, caminho_checkpoint: str, caminho_eventos='smart_home/data/eventos.csv') -> 'RelatoriosObserver':
+        """
+        Restaura os agregados do checkpoint e aplica as linhas gravadas no CSV depois da posição
+        registrada nele. A continuação não depende de timestamps, que podem se repetir ou chegar fora
+        de ordem com o despacho assíncrono e as rotinas paralelas.
+        Sem checkpoint, com um checkpoint inválido ou sem a posição no CSV, ou com um CSV menor do
+        que o registrado (arquivo trocado ou truncado), reconstrói tudo a partir do CSV.
+        """
+        motor, a_partir_do_byte = MotorRelatorios(), 0
+        try:
+            with open(caminho_checkpoint, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            tamanho_atual = os.path.getsize(caminho_eventos) if os.path.exists(caminho_eventos) else 0
+            posicao = dados.get("tamanho_eventos")
+            # Sem a posição não há como saber quais linhas já estão nos agregados: reaplicar o CSV contaria duas vezes
+            if (dados.get("versao") == cls.VERSAO_CHECKPOINT and isinstance(posicao, int)
+                    and 0 <= posicao <= tamanho_atual):
+                motor, a_partir_do_byte = MotorRelatorios.de_dict(dados), posicao
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            print(f"AVISO: Checkpoint de relatórios '{caminho_checkpoint}' inválido ({e}). Reconstruindo a partir do CSV.")
+            motor, a_partir_do_byte = MotorRelatorios(), 0
+
+        motor.processar_todos(iterar_eventos(caminho_eventos, a_partir_do_byte))
+        return cls(motor)
+
+def _em_ordem_cronologica(eventos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # As funções antigas ordenavam os eventos por timestamp; uma ordenação estável única é equivalente
+    if all(a['timestamp'] <= b['timestamp'] for a, b in pairwise(eventos)):
+        return eventos
+    return sorted(eventos, key=lambda e: e['timestamp'])
+
+# --- RELATÓRIOS (INTERFACE ORIGINAL, SOBRE O MOTOR) ---
+
+def relatorio_tempo_luz_ligada(eventos: List[Dict[str, Any]], dispositivos: List[Any]) -> Dict[str, float]:
+    return MotorRelatorios().processar_todos(_em_ordem_cronologica(eventos)).tempo_luz_ligada(dispositivos)
+
+def relatorio_consumo_tomada(eventos: List[Dict[str, Any]], dispositivos: List[Any]) -> Dict[str, float]:
+    """
+    Calcula o consumo total (em Wh) para cada tomada inteligente.
+    """
+    return MotorRelatorios().processar_todos(_em_ordem_cronologica(eventos)).consumo_tomada(dispositivos)
+
+def relatorio_dispositivos_mais_usados(eventos: List[Dict[str, Any]]) -> List[tuple[str, int]]:
+    """
+    Ordena os dispositivos pelo número de eventos registrados.
+    """
+    return MotorRelatorios().processar_todos(eventos).dispositivos_mais_usados()
+
+# --- RELATÓRIOS ADICIONAIS ---
+
+def relatorio_distribuicao_comandos_por_tipo(eventos: List[Dict[str, Any]], dispositivos: List[Any]) -> Dict[str, Dict[str, int]]:
+    """
+    Mostra a distribuição de comandos (ligar, desligar) por TIPO de dispositivo.
+    Os eventos recebidos não são modificados.
+    """
+    return MotorRelatorios().processar_todos(eventos).distribuicao_comandos_por_tipo(dispositivos)
+
+def relatorio_tentativas_invalidas_porta(dispositivos: List[Any]) -> Dict[str, int]:
+    """
+    Retorna o número de tentativas de trancar portas enquanto abertas.
+    Este dado vem diretamente do estado do objeto, não dos logs.
+    """
+    return MotorRelatorios.tentativas_invalidas_porta(dispositivos)
@@ -0,0 +1,213 @@
+# smart_home/core/rotinas.py
+"""
+Execução concorrente de rotinas.
+
+Cada passo de uma rotina pode ter, além de "id", "comando" e "argumentos":
+  - "nome": identificador usado em `depende_de` (padrão: a posição do passo, começando em 0)
+  - "depende_de": lista de nomes/posições de passos que precisam terminar antes deste
+  - "grupo": número do grupo paralelo; o passo espera todos os passos de grupos menores e todos os
+    passos sem "depende_de" nem "grupo" que vêm antes dele
+
+Um passo sem "depende_de" nem "grupo" é uma barreira: espera todos os passos anteriores, então rotinas
+no formato antigo continuam sequenciais. Passos no mesmo dispositivo nunca rodam ao mesmo tempo. Quando um passo
+termina com erro, os que dependem dele (direta ou indiretamente) não rodam e ficam como "pulado".
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .erros import ConfiguracaoInvalidaError
+
+CAMPOS_DEPENDENCIA = ("depende_de", "grupo")
+
+
+def usa_dependencias(passos: List[Dict[str, Any]]) -> bool:
+    return any(campo in passo for passo in passos for campo in CAMPOS_DEPENDENCIA)
+
+
+class ResultadoPasso:
+    def __init__(self, indice: int, passo: Dict[str, Any]):
+        self.indice = indice
+        self.nome = str(passo.get("nome", indice))
+        self.id_dispositivo = passo["id"]
+        self.comando = passo["comando"]
+        self.status = "pendente"  # ok | ignorado | erro | pulado | timeout | cancelado
+        self.estado_antes: Optional[str] = None
+        self.estado_depois: Optional[str] = None
+        self.latencia_s: Optional[float] = None
+        self.erro: Optional[str] = None
+
+    def __str__(self):
+        if self.status in ("erro", "pulado"):
+            detalhe = self.erro
+        elif self.status == "ok":
+            detalhe = f"{self.estado_antes} -> {self.estado_depois}"
+        else:
+            detalhe = "não executado" if self.status != "ignorado" else "transição inválida no estado atual"
+        latencia = f"{self.latencia_s * 1000:.1f} ms" if self.latencia_s is not None else "-"
+        return f"[{self.status}] {self.nome}: {self.id_dispositivo}.{self.comando} ({detalhe}) {latencia}"
+
+
+class ResultadoRotina:
+    def __init__(self, nome: str, passos: List[ResultadoPasso]):
+        self.nome = nome
+        self.passos = passos
+        self.duracao_s: Optional[float] = None  # None quando não foi medida
+        self.expirou = False  # True se o timeout da rotina foi atingido
+
+    @property
+    def erros(self) -> List[ResultadoPasso]:
+        return [p for p in self.passos if p.status == "erro"]
+
+    @property
+    def sucesso(self) -> bool:
+        return not self.expirou and all(p.status in ("ok", "ignorado") for p in self.passos)
+
+    def __str__(self):
+        duracao = f"{self.duracao_s * 1000:.1f} ms" if self.duracao_s is not None else "-"
+        linhas = [f"--- Rotina: {self.nome} ({duracao}{', TIMEOUT' if self.expirou else ''}) ---"]
+        linhas += [f"  {passo}" for passo in self.passos]
+        return "\n".join(linhas)
+
+
+class ExecutorRotinas:
+    """
+    Executa rotinas em um pool de threads. `aplicar` recebe (id, comando, argumentos) e devolve
+    (estado_antes, estado_depois), ou None quando o comando não é válido no estado atual.
+    """
+
+    def __init__(self, aplicar: Callable[[str, str, Optional[dict]], Optional[Tuple[str, str]]]):
+        self._aplicar = aplicar
+        self._locks_dispositivos: Dict[str, Lock] = {}
+        self._lock_locks = Lock()
+
+    def _lock_do_dispositivo(self, id_dispositivo: str) -> Lock:
+        with self._lock_locks:
+            return self._locks_dispositivos.setdefault(id_dispositivo, Lock())
+
+    @staticmethod
+    def dependencias(passos: List[Dict[str, Any]]) -> List[List[int]]:
+        """Resolve, para cada passo, as posições dos passos que ele precisa esperar."""
+        nomes = {str(passo.get("nome", i)): i for i, passo in enumerate(passos)}
+        grupos = {i: ExecutorRotinas._grupo(i, passo["grupo"]) for i, passo in enumerate(passos) if "grupo" in passo}
+        resultado = []
+        barreira = None  # último passo sem depende_de/grupo; ele já esperou todos os anteriores
+        for i, passo in enumerate(passos):
+            if "depende_de" in passo:
+                try:
+                    deps = [nomes[str(nome)] for nome in passo["depende_de"]]
+                except KeyError as e:
+                    raise ConfiguracaoInvalidaError(f"Passo {i} depende de um passo inexistente: {e}")
+            elif "grupo" in passo:
+                deps = [j for j, grupo in grupos.items() if grupo < grupos[i] and j != barreira]
+                if barreira is not None:
+                    deps.append(barreira)
+            else:
+                inicio = 0 if barreira is None else barreira
+                deps = list(range(inicio, i))
+                barreira = i
+            resultado.append(deps)
+        ExecutorRotinas._verificar_ciclos(resultado)
+        return resultado
+
+    @staticmethod
+    def _grupo(indice: int, grupo: Any) -> int:
+        """Grupos vêm do JSON como número ou texto ("1"); os dois viram int para poderem ser comparados."""
+        if not isinstance(grupo, bool) and isinstance(grupo, (int, str)):
+            try:
+                return int(grupo)
+            except ValueError:
+                pass
+        raise ConfiguracaoInvalidaError(f"Passo {indice} tem um grupo inválido: {grupo!r} (use um número inteiro).")
+
+    @staticmethod
+    def _verificar_ciclos(dependencias: List[List[int]]):
+        visitando, concluidos = set(), set()
+
+        def visitar(i):
+            if i in concluidos:
+                return
+            if i in visitando:
+                raise ConfiguracaoInvalidaError(f"Dependência circular envolvendo o passo {i}.")
+            visitando.add(i)
+            for dep in dependencias[i]:
+                visitar(dep)
+            visitando.discard(i)
+            concluidos.add(i)
+
+        for i in range(len(dependencias)):
+            visitar(i)
+
+    def _executar_passo(self, passo: Dict[str, Any]) -> Tuple[str, Optional[Tuple[str, str]], Optional[str], float]:
+        inicio = time.perf_counter()
+        try:
+            with self._lock_do_dispositivo(passo["id"]):
+                estados = self._aplicar(passo["id"], passo["comando"], passo.get("argumentos"))
+            status, erro = ("ignorado" if estados is None else "ok"), None
+        except Exception as e:
+            status, estados, erro = "erro", None, f"{e.__class__.__name__}: {e}"
+        return status, estados, erro, time.perf_counter() - inicio
+
+    def executar(self, nome: str, passos: List[Dict[str, Any]], max_paralelo: int = 8,
+                 timeout: Optional[float] = None) -> ResultadoRotina:
+        dependencias = self.dependencias(passos)
+        resultados = [ResultadoPasso(i, passo) for i, passo in enumerate(passos)]
+        rotina = ResultadoRotina(nome, resultados)
+        faltam = {i: set(deps) for i, deps in enumerate(dependencias)}
+        dependentes: Dict[int, List[int]] = {i: [] for i in range(len(passos))}
+        for i, deps in enumerate(dependencias):
+            for dep in deps:
+                dependentes[dep].append(i)
+
+        inicio = time.perf_counter()
+        limite = None if timeout is None else inicio + timeout
+        pool = ThreadPoolExecutor(max_workers=max_paralelo, thread_name_prefix=f"rotina-{nome}")
+        em_execucao, submetidos = {}, set()
+
+        def submeter_prontos(candidatos):
+            for i in candidatos:
+                if not faltam[i] and i not in submetidos:
+                    submetidos.add(i)
+                    em_execucao[pool.submit(self._executar_passo, passos[i])] = i
+
+        def pular_dependentes(falhou):
+            pendentes = list(dependentes[falhou])
+            while pendentes:
+                i = pendentes.pop()
+                if i not in submetidos:
+                    submetidos.add(i)  # nunca será submetido
+                    resultados[i].status = "pulado"
+                    resultados[i].erro = f"o passo '{resultados[falhou].nome}' falhou"
+                    pendentes.extend(dependentes[i])
+
+        try:
+            submeter_prontos(range(len(passos)))
+            while em_execucao:
+                restante = None if limite is None else limite - time.perf_counter()
+                if restante is not None and restante <= 0:
+                    rotina.expirou = True
+                    break
+                concluidos, _ = wait(em_execucao, timeout=restante, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    i = em_execucao.pop(futuro)
+                    resultado = resultados[i]
+                    resultado.status, estados, resultado.erro, resultado.latencia_s = futuro.result()
+                    if estados is not None:
+                        resultado.estado_antes, resultado.estado_depois = estados
+                    if resultado.status == "erro":
+                        pular_dependentes(i)
+                        continue
+                    for dependente in dependentes[i]:
+                        faltam[dependente].discard(i)
+                    submeter_prontos(dependentes[i])
+        finally:
+            # Passos que não chegaram a rodar são cancelados; os que já estão rodando não são interrompidos
+            pool.shutdown(wait=not rotina.expirou, cancel_futures=True)
+        for futuro, i in em_execucao.items():
+            resultados[i].status = "cancelado" if futuro.cancelled() else "timeout"
+        for resultado in resultados:
+            if resultado.status == "pendente":
+                resultado.status = "cancelado"
+        rotina.duracao_s = time.perf_counter() - inicio
+        return rotina
@@ -0,0 +1,4 @@
+from smart_home.core.cli import main
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file